@@ -0,0 +1,127 @@
+"""
+C-family lexer benchmark: checks that clike.Source accounts for every
+character of Java, C++ and JavaScript code, and times the lexer and the three
+analyzers built on it.
+
+Usage (from the repository root):
+    python -m benchmarks.clike_lexer [--corpus DIR] [--repeat N]
+
+Without --corpus the Java, C++ and JavaScript snippets in
+benchmarks/language_corpus.py are used; with it, every .java, .c/.cc/.cpp/.h/.hpp
+and .js/.mjs/.cjs file under DIR.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import clike
+import cpp
+import java
+import javascript
+from checkcodetype import Language
+
+DIALECTS = {
+    Language.JAVA: (clike.JAVA, java.detect_ai_generated_java),
+    Language.CPP: (clike.CPP, cpp.detect_ai_cpp_code),
+    Language.JAVASCRIPT: (clike.JAVASCRIPT, javascript.detect_ai_js),
+}
+EXTENSIONS = {
+    '.java': Language.JAVA,
+    '.c': Language.CPP, '.cc': Language.CPP, '.cpp': Language.CPP, '.h': Language.CPP, '.hpp': Language.CPP,
+    '.js': Language.JAVASCRIPT, '.mjs': Language.JAVASCRIPT, '.cjs': Language.JAVASCRIPT,
+}
+
+
+def load_sources(path):
+    """Every C-family file under path, as (name, language, code)."""
+    corpus = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            language = EXTENSIONS.get(os.path.splitext(name)[1])
+            if language is None:
+                continue
+            try:
+                with open(os.path.join(root, name), encoding='utf-8') as f:
+                    corpus.append((os.path.join(root, name), language, f.read()))
+            except (OSError, UnicodeDecodeError):
+                continue
+    return corpus
+
+def check(code, dialect):
+    """
+    Returns:
+        list: Problems with the lexer's view of code - text between tokens that
+              is not whitespace, overlapping tokens, or line flags that disagree
+              with the tokens.
+    """
+    source = clike.Source(code, dialect)
+    problems = []
+    position = 0
+    for token in source.tokens:
+        if token.start < position:
+            problems.append(f"token {token.text[:20]!r} overlaps the one before it")
+        elif code[position:token.start].strip():
+            problems.append(f"untokenized text {code[position:token.start][:20]!r}")
+        if code[token.start:token.end] != token.text:
+            problems.append(f"token {token.text[:20]!r} does not match its span")
+        position = max(position, token.end)
+    if code[position:].strip():
+        problems.append(f"untokenized text {code[position:][:20]!r} at the end")
+    spanned = set() # Lines a token touches, blank ones inside a block comment or template included
+    for token in source.tokens:
+        spanned.update(range(token.line, token.line + len(token.text.splitlines())))
+    for line, text in enumerate(source.lines):
+        if bool(source.line_flags[line]) != (line in spanned):
+            problems.append(f"line {line + 1} is {'marked' if source.line_flags[line] else 'unmarked'}: {text[:40]!r}")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', help="Directory of Java, C++ and JavaScript files (default: the built-in snippets)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing passes over the corpus (default: 5)")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        corpus = load_sources(args.corpus)
+    else:
+        from benchmarks.language_corpus import CORPUS
+        corpus = [(f"language_corpus[{index}]", language, code) for index, (language, code) in enumerate(CORPUS)
+                  if language in DIALECTS]
+    if not corpus:
+        print("No Java, C++ or JavaScript code found.")
+        return 1
+
+    failed = 0
+    for name, language, code in corpus:
+        problems = check(code, DIALECTS[language][0])
+        if problems:
+            failed += 1
+            print(f"  {name}: {'; '.join(problems[:3])}")
+
+    print(f"{'language':<12} {'files':>6} {'KiB':>8} {'tokens/s':>12} {'lex ms':>8} {'analyze ms':>11}")
+    for language, (dialect, detect) in DIALECTS.items():
+        codes = [code for _, code_language, code in corpus if code_language == language]
+        if not codes:
+            continue
+        tokens = sum(len(clike.Source(code, dialect).tokens) for code in codes)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for code in codes:
+                clike.Source(code, dialect)
+        lex = (time.perf_counter() - start) / args.repeat
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for code in codes:
+                detect(code)
+        analyze = (time.perf_counter() - start) / args.repeat
+        size = sum(map(len, codes)) / 1024
+        print(f"{language.value:<12} {len(codes):>6} {size:>8.0f} {tokens / lex if lex else 0:>12.0f}"
+              f" {lex * 1000:>8.1f} {analyze * 1000:>11.1f}")
+    print(f"files: {len(corpus)}, fully tokenized: {len(corpus) - failed}, with problems: {failed}")
+    return 0 if not failed else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Complexity parity benchmark: compares the cyclomatic complexity and Halstead
+metrics py.AstMetrics counts during its AST walk with radon's, and times both.
+
+Usage (from the repository root):
+    python -m benchmarks.complexity_parity [--corpus DIR] [--repeat N]
+
+Without --corpus the repository's own Python files and the Python snippets in
+benchmarks/language_corpus.py are used. Requires radon.
+"""
+
+import argparse
+import ast
+import math
+import os
+import sys
+import time
+
+from benchmarks.formatting_parity import load_directory
+from checkcodetype import Language
+from py import AstMetrics
+
+try:
+    from radon.metrics import h_visit_ast
+    from radon.visitors import ComplexityVisitor
+    RADON_AVAILABLE = True
+except ImportError:
+    RADON_AVAILABLE = False
+
+HALSTEAD_FIELDS = ("distinct_operators", "distinct_operands", "operators", "operands", "volume", "difficulty")
+
+
+def parse(code):
+    """The tree py.CodeAnalyzer would walk, or None if the code does not parse."""
+    try:
+        return ast.parse(code)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return None
+
+def halstead_values(report):
+    """The HALSTEAD_FIELDS of a radon HalsteadReport or of CodeBlock.halstead()."""
+    if isinstance(report, dict):
+        return tuple(report[field] for field in HALSTEAD_FIELDS)
+    return (report.h1, report.h2, report.N1, report.N2, report.volume, report.difficulty)
+
+def same_values(left, right):
+    return all(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9) for a, b in zip(left, right))
+
+def native_metrics(tree):
+    """
+    Returns:
+        dict: module complexity, (name, complexity) of the module-level functions
+              and classes, and Halstead values for the module and each outermost function.
+    """
+    metrics = AstMetrics(tree)
+    return {
+        "module": metrics.module.complexity,
+        "blocks": sorted((block.name, block.complexity) for block in metrics.module.children),
+        "halstead": halstead_values(metrics.module.halstead()),
+        "functions": sorted((block.name, halstead_values(block.halstead())) for block in metrics.halstead_functions),
+    }
+
+def radon_metrics(tree):
+    """The same dict as native_metrics, computed by radon."""
+    visitor = ComplexityVisitor.from_ast(tree)
+    halstead = h_visit_ast(tree)
+    return {
+        "module": visitor.complexity,
+        "blocks": sorted((block.name, block.complexity) for block in visitor.functions + visitor.classes),
+        "halstead": halstead_values(halstead.total),
+        "functions": sorted((name, halstead_values(report)) for name, report in halstead.functions),
+    }
+
+def differences(native, reference):
+    """Names of the fields on which native and reference disagree."""
+    differing = [field for field in ("module", "blocks") if native[field] != reference[field]]
+    if not same_values(native["halstead"], reference["halstead"]):
+        differing.append("halstead")
+    if (len(native["functions"]) != len(reference["functions"])
+            or any(a[0] != b[0] or not same_values(a[1], b[1])
+                   for a, b in zip(native["functions"], reference["functions"]))):
+        differing.append("functions")
+    return differing
+
+def compare(trees):
+    """
+    Returns:
+        list: (name, differing fields) for every tree on which the engines disagree.
+    """
+    mismatched = []
+    for name, tree in trees:
+        differing = differences(native_metrics(tree), radon_metrics(tree))
+        if differing:
+            mismatched.append((name, differing))
+    return mismatched
+
+def time_engines(trees, repeat):
+    """
+    Returns:
+        dict: Seconds per pass for the full AstMetrics walk on the parsed tree
+              and for radon's complexity and Halstead visitors re-parsing the source.
+    """
+    timings = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, tree, _ in trees:
+            AstMetrics(tree)
+    timings['AstMetrics (tree reused)'] = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, _, code in trees:
+            ComplexityVisitor.from_ast(ast.parse(code))
+            h_visit_ast(ast.parse(code))
+    timings['radon (with parse)'] = (time.perf_counter() - start) / repeat
+    return timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', help="Directory of Python files (default: this repository and the built-in snippets)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing passes over the corpus (default: 5)")
+    args = parser.parse_args(argv)
+
+    if not RADON_AVAILABLE:
+        print("radon is not installed; nothing to compare against.")
+        return 1
+
+    if args.corpus:
+        corpus = load_directory(args.corpus)
+    else:
+        from benchmarks.language_corpus import CORPUS
+        corpus = load_directory(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        corpus += [(f"language_corpus[{index}]", code.strip()) for index, (language, code) in enumerate(CORPUS)
+                   if language == Language.PYTHON]
+    trees = [(name, parse(code), code) for name, code in corpus]
+    trees = [entry for entry in trees if entry[1] is not None]
+    if not trees:
+        print("No parseable Python snippets found.")
+        return 1
+
+    mismatched = compare([(name, tree) for name, tree, _ in trees])
+    print(f"snippets: {len(trees)}, identical: {len(trees) - len(mismatched)}, mismatched: {len(mismatched)}")
+    for name, differing in mismatched[:10]:
+        print(f"  {name}: {', '.join(differing)}")
+
+    timings = time_engines(trees, args.repeat)
+    for engine, seconds in timings.items():
+        print(f"{engine:<26} {seconds * 1000:8.1f} ms/pass")
+    return 0 if not mismatched else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Formatting parity benchmark: compares the built-in PEP 8 engine (pystyle) with
+pycodestyle on a corpus of Python snippets and times both.
+
+Usage (from the repository root):
+    python -m benchmarks.formatting_parity [--corpus DIR] [--repeat N]
+
+Without --corpus the repository's own Python files and the Python snippets in
+benchmarks/language_corpus.py are used. Requires pycodestyle.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tokenize
+from collections import Counter
+
+import pystyle
+from checkcodetype import Language
+
+
+def load_directory(path):
+    """Every .py file under path, stripped the way py.CodeAnalyzer strips its input."""
+    corpus = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if not name.endswith('.py'):
+                continue
+            try:
+                with open(os.path.join(root, name), encoding='utf-8') as f:
+                    corpus.append((os.path.join(root, name), f.read().strip()))
+            except (OSError, UnicodeDecodeError):
+                continue
+    return corpus
+
+def tokenize_code(code):
+    """Tokenizes like py.CodeAnalyzer._tokenize: an empty list if the code does not tokenize."""
+    try:
+        return list(tokenize.tokenize(io.BytesIO(code.encode('utf-8')).readline))
+    except (tokenize.TokenError, SyntaxError):
+        return []
+
+def compare(corpus):
+    """
+    Returns:
+        tuple: (mismatched, failed, totals) - mismatched lists (name, builtin, reference)
+               for snippets whose per-code counts differ; failed names the snippets
+               pycodestyle itself crashed on; totals holds the summed counts of both
+               engines over the rest.
+    """
+    mismatched = []
+    failed = []
+    builtin_total, reference_total = Counter(), Counter()
+    for name, code in corpus:
+        lines = pystyle.physical_lines(code)
+        builtin = pystyle.count_violations(tokenize_code(code), lines)
+        try:
+            reference = pystyle.reference_violations(lines)
+        except Exception:
+            failed.append(name) # pycodestyle has no answer to compare against
+            continue
+        builtin_total.update(builtin)
+        reference_total.update(reference)
+        if builtin != reference:
+            mismatched.append((name, builtin, reference))
+    return mismatched, failed, (builtin_total, reference_total)
+
+def time_engines(corpus, repeat):
+    """
+    Returns:
+        dict: Seconds per pass for the built-in engine on existing tokens, the
+              built-in engine including tokenization, and pycodestyle.
+    """
+    prepared = [(pystyle.physical_lines(code), tokenize_code(code), code) for _, code in corpus]
+    timings = {}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for lines, tokens, _ in prepared:
+            pystyle.count_violations(tokens, lines)
+    timings['builtin (tokens reused)'] = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for lines, _, code in prepared:
+            pystyle.count_violations(tokenize_code(code), lines)
+    timings['builtin (with tokenize)'] = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for lines, _, _ in prepared:
+            pystyle.reference_violations(lines)
+    timings['pycodestyle'] = (time.perf_counter() - start) / repeat
+    return timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', help="Directory of Python files (default: this repository and the built-in snippets)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing passes over the corpus (default: 5)")
+    args = parser.parse_args(argv)
+
+    if not pystyle.PYCODESTYLE_AVAILABLE:
+        print("pycodestyle is not installed; nothing to compare against.")
+        return 1
+
+    if args.corpus:
+        corpus = load_directory(args.corpus)
+    else:
+        from benchmarks.language_corpus import CORPUS
+        corpus = load_directory(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        corpus += [(f"language_corpus[{index}]", code.strip()) for index, (language, code) in enumerate(CORPUS)
+                   if language == Language.PYTHON]
+    if not corpus:
+        print("No Python snippets found.")
+        return 1
+
+    mismatched, failed, (builtin_total, reference_total) = compare(corpus)
+    failed_names = set(failed)
+    corpus = [(name, code) for name, code in corpus if name not in failed_names]
+    print(f"{'code':<6} {'builtin':>8} {'pycodestyle':>12}")
+    for code in sorted(set(builtin_total) | set(reference_total)):
+        marker = "" if builtin_total[code] == reference_total[code] else "  <-"
+        print(f"{code:<6} {builtin_total[code]:>8} {reference_total[code]:>12}{marker}")
+    print(f"snippets: {len(corpus)}, identical: {len(corpus) - len(mismatched)}, mismatched: {len(mismatched)}"
+          f" (skipped {len(failed)} that pycodestyle fails on)")
+    for name, builtin, reference in mismatched[:10]:
+        difference = {code: (builtin[code], reference[code]) for code in set(builtin) | set(reference)
+                      if builtin[code] != reference[code]}
+        print(f"  {name}: {difference}")
+
+    timings = time_engines(corpus, args.repeat)
+    for engine, seconds in timings.items():
+        print(f"{engine:<24} {seconds * 1000:8.1f} ms/pass  ({timings['pycodestyle'] / seconds:.1f}x pycodestyle)")
+    return 0 if not mismatched else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Startup benchmark: imports each module in a fresh interpreter under
+`python -X importtime`, reports how long it took and what it pulled in, and
+checks it against a per-module time budget.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time [--repeat N] [--only MODULE ...] [--top N]
+
+A module fails if its best cumulative import time over --repeat runs exceeds
+its budget, or if a scoring module imports the database driver or another
+dependency that is only needed at the edges.
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Milliseconds per module, cumulative, best of --repeat fresh interpreters.
+# About twice what each takes today; the analyzers must stay well under what
+# the API and its database stack cost.
+BUDGETS = {
+    'clike': 15,
+    'words': 40,
+    'pystyle': 15,
+    'checkcodetype': 120,
+    'py': 80,
+    'java': 40,
+    'cpp': 30,
+    'javascript': 35,
+    'copymain': 30,
+    'keylog_codec': 10,
+    'keymain': 35,
+    'paste': 30,
+    'tab': 15,
+    'db': 20,
+    'cache': 130,
+    'writer': 120,
+    'dispatch': 180,
+    'workers': 280,
+    'main': 1200,
+}
+# Scoring modules run in every worker and in the benchmarks; they must not
+# import these at module level (db, and with it pymongo, is only for their
+# command-line entry points; pycodestyle only for the reference mode)
+SCORING_MODULES = ('clike', 'words', 'pystyle', 'checkcodetype', 'py', 'java', 'cpp', 'javascript',
+                   'copymain', 'keylog_codec', 'keymain', 'paste', 'tab')
+FORBIDDEN = ('db', 'pymongo', 'bson', 'pycodestyle', 'radon')
+
+
+def parse_importtime(stderr, module):
+    """
+    Reads `-X importtime` output for `import module`.
+
+    Args:
+        stderr (str): The interpreter's stderr.
+        module (str): The module that was imported.
+
+    Returns:
+        tuple: (cumulative microseconds, [(package, self microseconds, cumulative microseconds)]
+               for everything the import pulled in), or None if module never finished importing.
+    """
+    pending = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        package = name.strip()
+        entry = (package, int(self_us), int(cumulative_us))
+        if name[1:3] == '  ': # Indented: imported by a later top-level entry
+            pending.append(entry)
+            continue
+        if package == module:
+            return entry[2], pending + [entry]
+        pending = []
+    return None
+
+def measure(module, repeat):
+    """Best of repeat fresh imports of module, as parse_importtime returns it."""
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise ImportError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else module)
+        measured = parse_importtime(result.stderr, module)
+        if measured is None:
+            raise ImportError(f"no importtime entry for {module}")
+        if best is None or measured[0] < best[0]:
+            best = measured
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per module (default: 5)")
+    parser.add_argument('--only', nargs='+', choices=sorted(BUDGETS), help="Modules to measure (default: all)")
+    parser.add_argument('--top', type=int, default=3, help="Slowest imports to list per module (default: 3)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'module':<14} {'ms':>8} {'budget':>7}  slowest imports (self ms)")
+    for module in args.only or BUDGETS:
+        try:
+            cumulative, entries = measure(module, args.repeat)
+        except ImportError as e:
+            failures.append(f"{module}: import failed: {e}")
+            print(f"{module:<14} {'error':>8}")
+            continue
+        problems = []
+        if cumulative / 1000 > BUDGETS[module]:
+            problems.append(f"{cumulative / 1000:.1f} ms over its {BUDGETS[module]} ms budget")
+        if module in SCORING_MODULES:
+            imported = {package for package, _, _ in entries}
+            leaked = [name for name in FORBIDDEN if name in imported]
+            if leaked:
+                problems.append(f"imports {', '.join(leaked)}")
+        if problems:
+            failures.append(f"{module}: {'; '.join(problems)}")
+        slowest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:args.top]
+        print(f"{module:<14} {cumulative / 1000:>8.1f} {BUDGETS[module]:>7}  "
+              f"{', '.join(f'{package} {self_us / 1000:.1f}' for package, self_us, _ in slowest)}"
+              f"{'  <-' if problems else ''}")
+
+    print(f"failures: {len(failures)}")
+    for failure in failures:
+        print(f"  {failure}")
+    return 0 if not failures else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Incremental analysis benchmark: checks that py.CodeAnalyzer reports the same
+results and metrics when it analyzes code unit by unit (cold and warm unit
+cache) as when it analyzes it as a whole, and times re-analysis of edited
+snapshots, the way a submission is re-checked while it is being written.
+
+Usage (from the repository root):
+    python -m benchmarks.incremental_parity [--corpus DIR] [--edits N]
+
+Without --corpus the repository's own Python files and the Python snippets in
+benchmarks/language_corpus.py are used.
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import py
+from benchmarks.formatting_parity import load_directory
+from checkcodetype import Language
+
+UNIT_METRICS = ("units", "units_reused")
+
+
+def analyze(code):
+    """
+    Returns:
+        tuple: (JSON result, metrics without UNIT_METRICS, number of units or None).
+    """
+    analyzer = py.CodeAnalyzer(code)
+    output = analyzer.analyze()
+    metrics = {name: value for name, value in analyzer.results["metrics"].items() if name not in UNIT_METRICS}
+    return output, metrics, analyzer.results["metrics"].get("units")
+
+def compare(corpus):
+    """
+    Returns:
+        tuple: (mismatched names, number of snippets analyzed incrementally).
+    """
+    cache_size = py.UNIT_CACHE_SIZE
+    mismatched = []
+    incremental = 0
+    try:
+        for name, code in corpus:
+            py.UNIT_CACHE_SIZE = 0
+            full = analyze(code)[:2]
+            py.UNIT_CACHE_SIZE = cache_size
+            py._unit_cache.clear()
+            cold_output, cold_metrics, units = analyze(code)
+            warm = analyze(code)[:2]
+            incremental += units is not None
+            if not (full == (cold_output, cold_metrics) == warm):
+                mismatched.append(name)
+    finally:
+        py.UNIT_CACHE_SIZE = cache_size
+    return mismatched, incremental
+
+def edited_snapshots(code, edits, rng):
+    """The code after each of `edits` successive one-line edits at random positions."""
+    lines = code.splitlines(keepends=True)
+    snapshots = []
+    for _ in range(edits):
+        index = rng.randrange(len(lines))
+        line = lines[index]
+        indent = line[:len(line) - len(line.lstrip())]
+        lines.insert(index + 1, f"{indent}# edited {len(snapshots)}\n")
+        snapshots.append("".join(lines))
+    return snapshots
+
+def time_edits(corpus, edits):
+    """
+    Returns:
+        dict: Seconds to analyze every edited snapshot of the corpus as a whole
+              and incrementally (unit cache warmed by the original code).
+    """
+    rng = random.Random(0)
+    sessions = [(code, edited_snapshots(code, edits, rng)) for _, code in corpus if code.strip()]
+    cache_size = py.UNIT_CACHE_SIZE
+    timings = {}
+    try:
+        py.UNIT_CACHE_SIZE = 0
+        start = time.perf_counter()
+        for _, snapshots in sessions:
+            for snapshot in snapshots:
+                py.CodeAnalyzer(snapshot).analyze()
+        timings['whole file'] = time.perf_counter() - start
+
+        py.UNIT_CACHE_SIZE = cache_size
+        py._unit_cache.clear()
+        for code, _ in sessions:
+            py.CodeAnalyzer(code).analyze()
+        start = time.perf_counter()
+        for _, snapshots in sessions:
+            for snapshot in snapshots:
+                py.CodeAnalyzer(snapshot).analyze()
+        timings['incremental'] = time.perf_counter() - start
+    finally:
+        py.UNIT_CACHE_SIZE = cache_size
+    return timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', help="Directory of Python files (default: this repository and the built-in snippets)")
+    parser.add_argument('--edits', type=int, default=10, help="Edited snapshots timed per snippet (default: 10)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    if py.UNIT_CACHE_SIZE <= 0:
+        print("PY_UNIT_CACHE_SIZE is 0; incremental analysis is disabled.")
+        return 1
+
+    if args.corpus:
+        corpus = load_directory(args.corpus)
+    else:
+        from benchmarks.language_corpus import CORPUS
+        corpus = load_directory(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        corpus += [(f"language_corpus[{index}]", code.strip()) for index, (language, code) in enumerate(CORPUS)
+                   if language == Language.PYTHON]
+    if not corpus:
+        print("No Python snippets found.")
+        return 1
+
+    mismatched, incremental = compare(corpus)
+    print(f"snippets: {len(corpus)}, analyzed incrementally: {incremental}, "
+          f"identical: {len(corpus) - len(mismatched)}, mismatched: {len(mismatched)}")
+    for name in mismatched[:10]:
+        print(f"  {name}")
+
+    timings = time_edits(corpus, args.edits)
+    for mode, seconds in timings.items():
+        print(f"{mode:<12} {seconds * 1000:8.1f} ms  ({timings['whole file'] / seconds:.1f}x whole file)")
+    return 0 if not mismatched else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
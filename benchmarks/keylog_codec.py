@@ -0,0 +1,82 @@
+"""
+Packed key log benchmark: checks that keylog_codec round-trips synthetic
+sessions exactly and that keymain scores a document with packed key logs the
+same as one with the keyLogs array, and compares their BSON size and the time
+to decode and analyze each.
+
+Usage (from the repository root):
+    python -m benchmarks.keylog_codec [--keys N ...] [--repeat N] [--seed N]
+
+Sessions are checked with fractional timestamps, as make_session generates
+them, and rounded to whole milliseconds, as browsers log them.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import bson
+
+import keylog_codec
+import keymain
+from benchmarks.keystroke_analysis import make_session
+
+
+def best_time(function, repeat):
+    """Best time of repeat calls of function, in seconds, and its last result."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def check(key_logs):
+    """
+    Returns:
+        list: Ways decode_key_logs(encode_key_logs(key_logs)) differs from key_logs.
+    """
+    timestamps, codes, names = keylog_codec.decode_key_logs(keylog_codec.encode_key_logs(key_logs))
+    problems = []
+    if list(timestamps) != [float(log['timestamp']) for log in key_logs]:
+        problems.append("timestamps differ")
+    if [names[code] for code in codes] != [log.get('key', '') for log in key_logs]:
+        problems.append("keys differ")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--keys', type=int, nargs='+', default=[1000, 10000, 100000], help="Session lengths in keys (default: 1000 10000 100000)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing passes per session (default: 3)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for the sessions (default: 0)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL) # The detector logs per analysis
+
+    failures = []
+    print(f"{'keys':>8} {'timestamps':<11} {'BSON KiB':>9} {'packed KiB':>11} {'ratio':>6} {'BSON ms':>8} {'packed ms':>10}")
+    for keys in sorted(args.keys):
+        session = make_session(keys, args.seed)['keyLogs']
+        whole = [{'key': log['key'], 'timestamp': round(log['timestamp'])} for log in session]
+        for label, key_logs in (('fractional', session), ('whole ms', whole)):
+            problems = check(key_logs)
+            legacy = bson.encode({'keyLogs': key_logs})
+            packed = bson.encode({keymain.PACKED_KEY_LOGS_FIELD: keylog_codec.encode_key_logs(key_logs)})
+            # Each side decodes its BSON and scores it, as the analyzer does with a fetched document
+            legacy_seconds, legacy_result = best_time(lambda: keymain.SuspiciousBehaviorDetector().analyze(bson.decode(legacy)), args.repeat)
+            packed_seconds, packed_result = best_time(lambda: keymain.SuspiciousBehaviorDetector().analyze(bson.decode(packed)), args.repeat)
+            if packed_result != legacy_result:
+                problems.append("analysis results differ")
+            if problems:
+                failures.append(f"{keys} keys, {label}: {', '.join(problems)}")
+            print(f"{keys:>8} {label:<11} {len(legacy) / 1024:>9.1f} {len(packed) / 1024:>11.1f} {len(legacy) / len(packed):>5.1f}x"
+                  f" {legacy_seconds * 1000:>8.1f} {packed_seconds * 1000:>10.1f}{'  <-' if problems else ''}")
+
+    print(f"failures: {len(failures)}")
+    for failure in failures:
+        print(f"  {failure}")
+    return 0 if not failures else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Keystroke analysis benchmark: times keymain.SuspiciousBehaviorDetector on
+synthetic typing sessions of growing length (typing, pauses, Ctrl+V pastes
+and fast bursts) and checks that its cost grows linearly with the session.
+Each session is also fed to the detector in chunks, as a live session is,
+with its state stored as JSON between chunks; the results must be the same
+as analyzing the whole session at once, except that the paste and burst lists
+are the last ones of the whole analysis, and the state must stay the same
+size however long the session runs.
+
+Usage (from the repository root):
+    python -m benchmarks.keystroke_analysis [--keys N ...] [--repeat N] [--seed N] [--chunk N]
+"""
+
+import argparse
+import json
+import logging
+import random
+import string
+import sys
+import time
+
+import keymain
+
+# Seconds per key may grow this much from the shortest session to the longest
+GROWTH_LIMIT = 2.5
+# Largest live-session state, as JSON, in bytes
+STATE_SIZE_LIMIT = 4096
+# Details the live session keeps only the most recent entries of
+RECENT_FIELDS = ('rapid_paste_ctrl_v_timestamps', 'paste_burst_timestamps', 'paste_bursts')
+
+
+def make_session(keys, seed=0):
+    """
+    A synthetic activity document with about `keys` key logs: mostly ordinary
+    typing, with long pauses, Ctrl+V pastes and bursts of very fast keys mixed in.
+    """
+    rng = random.Random(seed)
+    timestamp = 1.7e12 # Milliseconds since the epoch, as the extension logs them
+    key_logs = []
+    while len(key_logs) < keys:
+        choice = rng.random()
+        if choice < 0.02:
+            key_logs.append({'key': 'Control', 'timestamp': timestamp})
+            timestamp += rng.uniform(20, 400)
+            key_logs.append({'key': 'v', 'timestamp': timestamp})
+        elif choice < 0.05:
+            for _ in range(rng.randint(3, 30)):
+                timestamp += rng.uniform(5, 60)
+                key_logs.append({'key': rng.choice(string.ascii_lowercase), 'timestamp': timestamp})
+        elif choice < 0.06:
+            timestamp += rng.uniform(15000, 60000)
+        timestamp += rng.uniform(40, 400)
+        key_logs.append({'key': rng.choice(string.ascii_letters + ' \n'), 'timestamp': timestamp})
+    return {'_id': f"session-{keys}-{seed}", 'keyLogs': key_logs[:keys]}
+
+def time_analysis(document, repeat):
+    """Best time of repeat analyses of document, in seconds, and the last result."""
+    best = float('inf')
+    for _ in range(repeat):
+        # analyze reads keyLogs without changing them, so the document can be reused
+        detector = keymain.SuspiciousBehaviorDetector()
+        start = time.perf_counter()
+        result = detector.analyze(document)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def time_chunks(document, chunk):
+    """
+    Feeds document's key logs to a detector chunk keys at a time, round-tripping
+    the state through JSON after each chunk as a checkpoint would.
+
+    Returns:
+        tuple: (seconds spent in update, results, size of the final state as JSON in bytes)
+    """
+    detector = keymain.SuspiciousBehaviorDetector()
+    state = detector.new_state()
+    key_logs = document['keyLogs']
+    seconds = 0.0
+    for start in range(0, len(key_logs), chunk):
+        begin = time.perf_counter()
+        detector.update(state, key_logs[start:start + chunk])
+        seconds += time.perf_counter() - begin
+        state = json.loads(json.dumps(state))
+    return seconds, detector.results(state), len(json.dumps(state))
+
+def same_results(chunked, whole):
+    """
+    Whether a live session's results agree with the whole session's: equal,
+    except for the paste and burst lists, which must be the ends of the whole session's.
+    """
+    chunked_details, whole_details = dict(chunked['details']), dict(whole['details'])
+    for field in RECENT_FIELDS:
+        recent, full = chunked_details.pop(field), whole_details.pop(field)
+        if len(recent) > len(full) or full[len(full) - len(recent):] != recent:
+            return False
+    return {**chunked, 'details': chunked_details} == {**whole, 'details': whole_details}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--keys', type=int, nargs='+', default=[1000, 10000, 100000], help="Session lengths in keys (default: 1000 10000 100000)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing passes per session (default: 3)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for the sessions (default: 0)")
+    parser.add_argument('--chunk', type=int, default=50, help="Keys per chunk for the live session (default: 50)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL) # The detector logs per analysis
+
+    failures = []
+    per_key = []
+    print(f"{'keys':>8} {'ms':>9} {'keys/s':>11} {'chunked ms':>11} {'state KiB':>10} {'score':>7}")
+    for keys in sorted(args.keys):
+        document = make_session(keys, args.seed)
+        seconds, result = time_analysis(document, args.repeat)
+        if result['error']:
+            failures.append(f"{keys} keys: {result['error']}")
+        chunked_seconds, chunked_result, state_size = time_chunks(document, args.chunk)
+        if not same_results(chunked_result, result):
+            failures.append(f"{keys} keys: results differ when fed {args.chunk} keys at a time")
+        if state_size > STATE_SIZE_LIMIT:
+            failures.append(f"{keys} keys: live state is {state_size} bytes, over {STATE_SIZE_LIMIT}")
+        per_key.append(seconds / keys)
+        print(f"{keys:>8} {seconds * 1000:>9.1f} {keys / seconds:>11.0f} {chunked_seconds * 1000:>11.1f}"
+              f" {state_size / 1024:>10.1f} {result['suspicious_percentage']:>7.2f}")
+
+    growth = per_key[-1] / per_key[0] if per_key and per_key[0] else 1.0
+    if growth > GROWTH_LIMIT:
+        failures.append(f"{growth:.1f}x slower per key on the longest session than on the shortest")
+    print(f"failures: {len(failures)}")
+    for failure in failures:
+        print(f"  {failure}")
+    return 0 if not failures else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
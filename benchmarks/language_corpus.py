@@ -0,0 +1,598 @@
+"""
+Labeled code snippets for the language detection benchmark.
+
+Each entry is (language, code). The snippets are the kind of code the API
+sees: contest and interview submissions (LeetCode-style classes, full
+programs reading stdin) plus short fragments pasted on their own.
+"""
+
+from checkcodetype import Language
+
+CORPUS = [
+    # --- Python ---
+    (Language.PYTHON, '''class Solution:
+    def twoSum(self, nums: List[int], target: int) -> List[int]:
+        seen = {}
+        for i, n in enumerate(nums):
+            if target - n in seen:
+                return [seen[target - n], i]
+            seen[n] = i
+        return []
+'''),
+    (Language.PYTHON, '''import sys
+input = sys.stdin.readline
+
+def main():
+    n = int(input())
+    a = list(map(int, input().split()))
+    best = cur = a[0]
+    for x in a[1:]:
+        cur = max(x, cur + x)
+        best = max(best, cur)
+    print(best)
+
+if __name__ == "__main__":
+    main()
+'''),
+    (Language.PYTHON, '''from collections import deque
+
+def bfs(graph, start):
+    dist = {start: 0}
+    q = deque([start])
+    while q:
+        u = q.popleft()
+        for v in graph[u]:
+            if v not in dist:
+                dist[v] = dist[u] + 1
+                q.append(v)
+    return dist
+'''),
+    (Language.PYTHON, '''class Solution:
+    def isValid(self, s: str) -> bool:
+        stack = []
+        pairs = {')': '(', ']': '[', '}': '{'}
+        for ch in s:
+            if ch in pairs:
+                if not stack or stack.pop() != pairs[ch]:
+                    return False
+            else:
+                stack.append(ch)
+        return not stack
+'''),
+    (Language.PYTHON, '''def fib(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+print([fib(i) for i in range(10)])
+'''),
+    (Language.PYTHON, '''t = int(input())
+for _ in range(t):
+    n, k = map(int, input().split())
+    s = input().strip()
+    count = s.count('1')
+    if count >= k:
+        print("YES")
+    else:
+        print("NO")
+'''),
+    (Language.PYTHON, '''import heapq
+
+class Solution:
+    def kClosest(self, points, k):
+        heap = []
+        for x, y in points:
+            heapq.heappush(heap, (-(x * x + y * y), x, y))
+            if len(heap) > k:
+                heapq.heappop(heap)
+        return [[x, y] for _, x, y in heap]
+'''),
+    (Language.PYTHON, '''async def fetch_all(session, urls):
+    results = []
+    for url in urls:
+        async with session.get(url) as resp:
+            results.append(await resp.json())
+    return results
+'''),
+    (Language.PYTHON, '''class Node:
+    def __init__(self, val=0, next=None):
+        self.val = val
+        self.next = next
+
+def reverse(head):
+    prev = None
+    while head:
+        head.next, prev, head = prev, head, head.next
+    return prev
+'''),
+    (Language.PYTHON, '''n = int(input())
+dp = [0] * (n + 1)
+dp[0] = 1
+for i in range(1, n + 1):
+    dp[i] = dp[i - 1]
+    if i >= 2:
+        dp[i] += dp[i - 2]
+print(dp[n] % (10 ** 9 + 7))
+'''),
+    (Language.PYTHON, '''@lru_cache(maxsize=None)
+def solve(i, j):
+    if i == len(a) or j == len(b):
+        return 0
+    if a[i] == b[j]:
+        return 1 + solve(i + 1, j + 1)
+    return max(solve(i + 1, j), solve(i, j + 1))
+'''),
+    (Language.PYTHON, '''words = input().split()
+freq = {}
+for w in words:
+    freq[w] = freq.get(w, 0) + 1
+for w, c in sorted(freq.items(), key=lambda kv: (-kv[1], kv[0])):
+    print(f"{w}: {c}")
+'''),
+
+    # --- C++ ---
+    (Language.CPP, '''class Solution {
+public:
+    vector<int> twoSum(vector<int>& nums, int target) {
+        unordered_map<int, int> seen;
+        for (int i = 0; i < nums.size(); i++) {
+            if (seen.count(target - nums[i])) {
+                return {seen[target - nums[i]], i};
+            }
+            seen[nums[i]] = i;
+        }
+        return {};
+    }
+};
+'''),
+    (Language.CPP, '''#include <bits/stdc++.h>
+using namespace std;
+
+int main() {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+    int n;
+    cin >> n;
+    vector<long long> a(n);
+    for (auto &x : a) cin >> x;
+    sort(a.begin(), a.end());
+    cout << a[n / 2] << "\\n";
+    return 0;
+}
+'''),
+    (Language.CPP, '''class Solution {
+public:
+    bool isValid(string s) {
+        stack<char> st;
+        for (char c : s) {
+            if (c == '(' || c == '[' || c == '{') st.push(c);
+            else {
+                if (st.empty()) return false;
+                char t = st.top(); st.pop();
+                if ((c == ')' && t != '(') || (c == ']' && t != '[') || (c == '}' && t != '{')) return false;
+            }
+        }
+        return st.empty();
+    }
+};
+'''),
+    (Language.CPP, '''#include <iostream>
+#include <vector>
+
+struct Node {
+    int val;
+    Node* next;
+    Node(int v) : val(v), next(nullptr) {}
+};
+
+Node* reverse(Node* head) {
+    Node* prev = nullptr;
+    while (head) {
+        Node* nxt = head->next;
+        head->next = prev;
+        prev = head;
+        head = nxt;
+    }
+    return prev;
+}
+'''),
+    (Language.CPP, '''int t;
+cin >> t;
+while (t--) {
+    int n, k;
+    cin >> n >> k;
+    string s;
+    cin >> s;
+    int ones = count(s.begin(), s.end(), '1');
+    cout << (ones >= k ? "YES" : "NO") << endl;
+}
+'''),
+    (Language.CPP, '''template <typename T>
+T gcd(T a, T b) {
+    return b == 0 ? a : gcd(b, a % b);
+}
+
+const int MOD = 1e9 + 7;
+long long power(long long b, long long e) {
+    long long r = 1;
+    for (; e > 0; e >>= 1, b = b * b % MOD)
+        if (e & 1) r = r * b % MOD;
+    return r;
+}
+'''),
+    (Language.CPP, '''class Solution {
+public:
+    int maxProfit(vector<int>& prices) {
+        int best = 0, lo = INT_MAX;
+        for (int p : prices) {
+            lo = min(lo, p);
+            best = max(best, p - lo);
+        }
+        return best;
+    }
+};
+'''),
+    (Language.CPP, '''#include <cstdio>
+#define MAXN 100005
+
+int parent[MAXN];
+
+int find(int x) {
+    return parent[x] == x ? x : parent[x] = find(parent[x]);
+}
+
+int main() {
+    int n, m;
+    scanf("%d %d", &n, &m);
+    for (int i = 1; i <= n; i++) parent[i] = i;
+    printf("%d\\n", find(n));
+}
+'''),
+    (Language.CPP, '''vector<vector<int>> adj(n);
+vector<int> dist(n, -1);
+queue<int> q;
+q.push(0);
+dist[0] = 0;
+while (!q.empty()) {
+    int u = q.front(); q.pop();
+    for (int v : adj[u]) {
+        if (dist[v] == -1) { dist[v] = dist[u] + 1; q.push(v); }
+    }
+}
+'''),
+    (Language.CPP, '''class Solution {
+public:
+    ListNode* mergeTwoLists(ListNode* l1, ListNode* l2) {
+        ListNode dummy(0);
+        ListNode* tail = &dummy;
+        while (l1 && l2) {
+            if (l1->val < l2->val) { tail->next = l1; l1 = l1->next; }
+            else { tail->next = l2; l2 = l2->next; }
+            tail = tail->next;
+        }
+        tail->next = l1 ? l1 : l2;
+        return dummy.next;
+    }
+};
+'''),
+    (Language.CPP, '''map<string, int> freq;
+string w;
+while (cin >> w) freq[w]++;
+for (const auto& [word, c] : freq) {
+    cout << word << ": " << c << '\\n';
+}
+'''),
+    (Language.CPP, '''class Solution {
+public:
+    int climbStairs(int n) {
+        if (n <= 2) return n;
+        int a = 1, b = 2;
+        for (int i = 3; i <= n; ++i) {
+            int c = a + b;
+            a = b;
+            b = c;
+        }
+        return b;
+    }
+};
+'''),
+
+    # --- Java ---
+    (Language.JAVA, '''class Solution {
+    public int[] twoSum(int[] nums, int target) {
+        Map<Integer, Integer> seen = new HashMap<>();
+        for (int i = 0; i < nums.length; i++) {
+            if (seen.containsKey(target - nums[i])) {
+                return new int[] { seen.get(target - nums[i]), i };
+            }
+            seen.put(nums[i], i);
+        }
+        return new int[0];
+    }
+}
+'''),
+    (Language.JAVA, '''import java.util.*;
+
+public class Main {
+    public static void main(String[] args) {
+        Scanner sc = new Scanner(System.in);
+        int n = sc.nextInt();
+        long[] a = new long[n];
+        for (int i = 0; i < n; i++) a[i] = sc.nextLong();
+        Arrays.sort(a);
+        System.out.println(a[n / 2]);
+    }
+}
+'''),
+    (Language.JAVA, '''class Solution {
+    public boolean isValid(String s) {
+        Deque<Character> stack = new ArrayDeque<>();
+        for (char c : s.toCharArray()) {
+            if (c == '(' || c == '[' || c == '{') stack.push(c);
+            else {
+                if (stack.isEmpty()) return false;
+                char t = stack.pop();
+                if ((c == ')' && t != '(') || (c == ']' && t != '[') || (c == '}' && t != '{')) return false;
+            }
+        }
+        return stack.isEmpty();
+    }
+}
+'''),
+    (Language.JAVA, '''class Solution {
+    public ListNode reverseList(ListNode head) {
+        ListNode prev = null;
+        while (head != null) {
+            ListNode next = head.next;
+            head.next = prev;
+            prev = head;
+            head = next;
+        }
+        return prev;
+    }
+}
+'''),
+    (Language.JAVA, '''import java.io.*;
+import java.util.*;
+
+public class Main {
+    public static void main(String[] args) throws IOException {
+        BufferedReader br = new BufferedReader(new InputStreamReader(System.in));
+        int t = Integer.parseInt(br.readLine().trim());
+        StringBuilder sb = new StringBuilder();
+        while (t-- > 0) {
+            StringTokenizer st = new StringTokenizer(br.readLine());
+            int n = Integer.parseInt(st.nextToken());
+            sb.append(n * 2).append('\\n');
+        }
+        System.out.print(sb);
+    }
+}
+'''),
+    (Language.JAVA, '''class Solution {
+    public int maxProfit(int[] prices) {
+        int best = 0, lo = Integer.MAX_VALUE;
+        for (int p : prices) {
+            lo = Math.min(lo, p);
+            best = Math.max(best, p - lo);
+        }
+        return best;
+    }
+}
+'''),
+    (Language.JAVA, '''public class Counter {
+    private final Map<String, Integer> counts = new TreeMap<>();
+
+    public void add(String word) {
+        counts.merge(word, 1, Integer::sum);
+    }
+
+    @Override
+    public String toString() {
+        return counts.toString();
+    }
+}
+'''),
+    (Language.JAVA, '''List<List<Integer>> adj = new ArrayList<>();
+for (int i = 0; i < n; i++) adj.add(new ArrayList<>());
+int[] dist = new int[n];
+Arrays.fill(dist, -1);
+Queue<Integer> q = new LinkedList<>();
+q.add(0);
+dist[0] = 0;
+while (!q.isEmpty()) {
+    int u = q.poll();
+    for (int v : adj.get(u)) {
+        if (dist[v] == -1) { dist[v] = dist[u] + 1; q.add(v); }
+    }
+}
+'''),
+    (Language.JAVA, '''class Solution {
+    public int climbStairs(int n) {
+        if (n <= 2) return n;
+        int a = 1, b = 2;
+        for (int i = 3; i <= n; ++i) {
+            int c = a + b;
+            a = b;
+            b = c;
+        }
+        return b;
+    }
+}
+'''),
+    (Language.JAVA, '''class Solution {
+    public List<String> fizzBuzz(int n) {
+        List<String> out = new ArrayList<>();
+        for (int i = 1; i <= n; i++) {
+            if (i % 15 == 0) out.add("FizzBuzz");
+            else if (i % 3 == 0) out.add("Fizz");
+            else if (i % 5 == 0) out.add("Buzz");
+            else out.add(String.valueOf(i));
+        }
+        return out;
+    }
+}
+'''),
+    (Language.JAVA, '''static long power(long b, long e, long mod) {
+    long r = 1;
+    b %= mod;
+    while (e > 0) {
+        if ((e & 1) == 1) r = r * b % mod;
+        b = b * b % mod;
+        e >>= 1;
+    }
+    return r;
+}
+'''),
+    (Language.JAVA, '''public interface Shape {
+    double area();
+}
+
+public class Circle implements Shape {
+    private final double r;
+
+    public Circle(double r) {
+        this.r = r;
+    }
+
+    public double area() {
+        return Math.PI * r * r;
+    }
+}
+'''),
+
+    # --- JavaScript ---
+    (Language.JAVASCRIPT, '''/**
+ * @param {number[]} nums
+ * @param {number} target
+ * @return {number[]}
+ */
+var twoSum = function(nums, target) {
+    const seen = new Map();
+    for (let i = 0; i < nums.length; i++) {
+        if (seen.has(target - nums[i])) {
+            return [seen.get(target - nums[i]), i];
+        }
+        seen.set(nums[i], i);
+    }
+    return [];
+};
+'''),
+    (Language.JAVASCRIPT, '''const readline = require('readline');
+const rl = readline.createInterface({ input: process.stdin });
+const lines = [];
+rl.on('line', (line) => lines.push(line));
+rl.on('close', () => {
+    const n = parseInt(lines[0]);
+    const a = lines[1].split(' ').map(Number);
+    a.sort((x, y) => x - y);
+    console.log(a[Math.floor(n / 2)]);
+});
+'''),
+    (Language.JAVASCRIPT, '''var isValid = function(s) {
+    const stack = [];
+    const pairs = { ')': '(', ']': '[', '}': '{' };
+    for (const ch of s) {
+        if (ch in pairs) {
+            if (stack.pop() !== pairs[ch]) return false;
+        } else {
+            stack.push(ch);
+        }
+    }
+    return stack.length === 0;
+};
+'''),
+    (Language.JAVASCRIPT, '''function reverseList(head) {
+    let prev = null;
+    while (head) {
+        const next = head.next;
+        head.next = prev;
+        prev = head;
+        head = next;
+    }
+    return prev;
+}
+'''),
+    (Language.JAVASCRIPT, '''const maxProfit = (prices) => {
+    let best = 0, lo = Infinity;
+    for (const p of prices) {
+        lo = Math.min(lo, p);
+        best = Math.max(best, p - lo);
+    }
+    return best;
+};
+'''),
+    (Language.JAVASCRIPT, '''async function loadUsers() {
+    const res = await fetch('/api/users');
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const users = await res.json();
+    document.getElementById('count').textContent = users.length;
+    return users;
+}
+'''),
+    (Language.JAVASCRIPT, '''class Counter {
+    constructor() {
+        this.counts = {};
+    }
+
+    add(word) {
+        this.counts[word] = (this.counts[word] || 0) + 1;
+    }
+
+    top() {
+        return Object.entries(this.counts).sort((a, b) => b[1] - a[1]);
+    }
+}
+
+module.exports = Counter;
+'''),
+    (Language.JAVASCRIPT, '''var climbStairs = function(n) {
+    if (n <= 2) return n;
+    let a = 1, b = 2;
+    for (let i = 3; i <= n; i++) {
+        [a, b] = [b, a + b];
+    }
+    return b;
+};
+'''),
+    (Language.JAVASCRIPT, '''const fizzBuzz = n => Array.from({ length: n }, (_, i) => {
+    const k = i + 1;
+    if (k % 15 === 0) return 'FizzBuzz';
+    if (k % 3 === 0) return 'Fizz';
+    if (k % 5 === 0) return 'Buzz';
+    return String(k);
+});
+console.log(fizzBuzz(15).join('\\n'));
+'''),
+    (Language.JAVASCRIPT, '''const dist = new Array(n).fill(-1);
+const q = [0];
+dist[0] = 0;
+while (q.length) {
+    const u = q.shift();
+    for (const v of adj[u]) {
+        if (dist[v] === -1) {
+            dist[v] = dist[u] + 1;
+            q.push(v);
+        }
+    }
+}
+'''),
+    (Language.JAVASCRIPT, '''import { useState } from 'react';
+
+export default function Clicker() {
+    const [count, setCount] = useState(0);
+    return count;
+}
+'''),
+    (Language.JAVASCRIPT, '''let input = '';
+process.stdin.on('data', chunk => input += chunk);
+process.stdin.on('end', () => {
+    const [t, ...rest] = input.trim().split('\\n');
+    for (let i = 0; i < +t; i++) {
+        const [n, k] = rest[i].split(' ').map(Number);
+        console.log(n >= k ? 'YES' : 'NO');
+    }
+});
+'''),
+]
@@ -0,0 +1,189 @@
+"""
+Language detection benchmark: accuracy and throughput of
+checkcodetype.detect_language on a labeled corpus.
+
+Usage (from the repository root):
+    python -m benchmarks.language_detection [--corpus DIR] [--repeat N]
+
+Without --corpus the built-in snippets in benchmarks/language_corpus.py are
+used. With --corpus, every file under DIR whose extension maps to a language
+(.py, .cpp/.cc/.hpp, .java, .js) is added as one snippet.
+
+Every snippet is also checked for feature parity: count_features must count
+each FEATURES pattern exactly as re.findall does on the preprocessed code.
+The run fails if any count differs.
+
+The syntax-feature scan (one finditer per pattern) is also timed against a
+single finditer over all the patterns folded into one alternation of named
+groups, for reference; see checkcodetype's Compiled Feature Scanner notes.
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+
+import checkcodetype
+from checkcodetype import Language, detect_language
+
+EXTENSIONS = {
+    '.py': Language.PYTHON,
+    '.cpp': Language.CPP,
+    '.cc': Language.CPP,
+    '.hpp': Language.CPP,
+    '.java': Language.JAVA,
+    '.js': Language.JAVASCRIPT,
+}
+
+
+def load_directory(path):
+    """Labels every recognised source file under path by its extension."""
+    corpus = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            language = EXTENSIONS.get(os.path.splitext(name)[1])
+            if language is None:
+                continue
+            try:
+                with open(os.path.join(root, name), encoding='utf-8') as f:
+                    corpus.append((language, f.read()))
+            except (OSError, UnicodeDecodeError):
+                continue
+    return corpus
+
+
+def reference_counts(processed_code):
+    """Feature counts the way analyze_code originally took them: one re.findall per FEATURES pattern."""
+    counts = []
+    for patterns in checkcodetype.FEATURES.values():
+        for pattern, _ in patterns:
+            # Long spans are bounded in the scanner; bound them the same way here
+            pattern = checkcodetype.UNBOUNDED_DOT_RE.sub(f'.{{0,{checkcodetype.MAX_FEATURE_SPAN}}}', pattern)
+            counts.append(len(re.findall(pattern, processed_code, flags=re.MULTILINE)))
+    return counts
+
+
+def parity(corpus):
+    """
+    Returns:
+        list: (snippet index, expected language, [(language, pattern, counted, expected)])
+              for every snippet whose count_features differ from reference_counts.
+    """
+    patterns = [(lang, pattern) for lang, lang_patterns in checkcodetype.FEATURES.items() for pattern, _ in lang_patterns]
+    mismatches = []
+    for index, (expected, code) in enumerate(corpus):
+        processed_code = checkcodetype.preprocess_code(code)[0]
+        counted, _ = checkcodetype.count_features(processed_code)
+        differences = [(*patterns[feature_id], got, want)
+                       for feature_id, (got, want) in enumerate(zip(counted, reference_counts(processed_code)))
+                       if got != want]
+        if differences:
+            mismatches.append((index, expected, differences))
+    return mismatches
+
+
+def alternation_counter():
+    """
+    The syntax features folded into one alternation of named groups, counted
+    by m.lastgroup. Each position counts for the first feature that matches
+    there, so counts can differ from one finditer per pattern.
+
+    Returns:
+        callable: processed code -> Counter of matches per SYNTAX_FEATURES index.
+    """
+    combined = re.compile('|'.join(f'(?P<f{index}>{pattern.pattern})'
+                                   for index, (pattern, _) in enumerate(checkcodetype.SYNTAX_FEATURES)), re.MULTILINE)
+    return lambda processed_code: Counter(int(match.lastgroup[1:]) for match in combined.finditer(processed_code))
+
+def time_syntax_scans(corpus, repeat):
+    """
+    Returns:
+        tuple: (seconds for one finditer per pattern, seconds for one finditer
+               over the alternation, number of snippets whose counts differ).
+    """
+    codes = [checkcodetype.preprocess_code(code)[0] for _, code in corpus]
+    count_alternation = alternation_counter()
+
+    def count_per_pattern(processed_code):
+        counts = Counter()
+        for index, (pattern, _) in enumerate(checkcodetype.SYNTAX_FEATURES):
+            count = sum(1 for _ in pattern.finditer(processed_code))
+            if count:
+                counts[index] = count
+        return counts
+
+    timings = []
+    for count in (count_per_pattern, count_alternation):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for processed_code in codes:
+                count(processed_code)
+        timings.append(time.perf_counter() - start)
+    differing = sum(1 for processed_code in codes if count_per_pattern(processed_code) != count_alternation(processed_code))
+    return timings[0], timings[1], differing
+
+def run(corpus, repeat):
+    """
+    Returns:
+        tuple: (confusion, snippets_per_second, megabytes_per_second) where
+               confusion maps each expected language to a Counter of detections.
+    """
+    confusion = defaultdict(Counter)
+    for expected, code in corpus:
+        confusion[expected][detect_language(code)] += 1
+
+    total_chars = sum(len(code) for _, code in corpus)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, code in corpus:
+            detect_language(code)
+    elapsed = time.perf_counter() - start
+    return confusion, repeat * len(corpus) / elapsed, repeat * total_chars / elapsed / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', help="Directory of labeled source files (default: built-in snippets)")
+    parser.add_argument('--repeat', type=int, default=20, help="Timing passes over the corpus (default: 20)")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL) # The detector logs every call
+
+    if args.corpus:
+        corpus = load_directory(args.corpus)
+    else:
+        from benchmarks.language_corpus import CORPUS
+        corpus = CORPUS
+    if not corpus:
+        print("No labeled snippets found.")
+        return 1
+
+    confusion, snippets_per_second, megabytes_per_second = run(corpus, args.repeat)
+
+    correct = sum(confusion[language][language] for language in confusion)
+    print(f"{'language':<12} {'snippets':>8} {'correct':>8} {'accuracy':>9}  misdetected as")
+    for language in sorted(confusion, key=str):
+        detected = confusion[language]
+        total = sum(detected.values())
+        misses = ", ".join(f"{other}: {count}" for other, count in detected.most_common() if other != language)
+        print(f"{language:<12} {total:>8} {detected[language]:>8} {detected[language] / total:>9.1%}  {misses}")
+    print(f"{'overall':<12} {len(corpus):>8} {correct:>8} {correct / len(corpus):>9.1%}")
+    print(f"throughput: {snippets_per_second:,.0f} snippets/sec ({megabytes_per_second:.2f} MB/sec)")
+
+    per_pattern, alternation, differing = time_syntax_scans(corpus, args.repeat)
+    print(f"syntax scan: {per_pattern * 1000:.0f} ms one finditer per pattern, {alternation * 1000:.0f} ms one alternation"
+          f" ({alternation / per_pattern:.1f}x), counts differ on {differing} of {len(corpus)} snippets")
+
+    mismatches = parity(corpus)
+    print(f"feature parity: {len(corpus) - len(mismatches)} of {len(corpus)} snippets match re.findall")
+    for index, expected, differences in mismatches:
+        for lang, pattern, got, want in differences:
+            print(f"  snippet {index} ({expected}): {lang} {pattern!r} counted {got}, re.findall {want}")
+    return 0 if not mismatches else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Pathological-input benchmark: feeds every analyzer long minified lines,
+unclosed comment, string, template and regex openers, long whitespace runs
+and deep nesting, and checks that each one keeps a minimum throughput and
+scales linearly with the size of its input.
+
+Usage (from the repository root):
+    python -m benchmarks.regex_throughput [--size CHARS] [--only NAME ...]
+
+Each input is timed at --size characters and at four times that. An analyzer
+fails an input if it grows more than GROWTH_LIMIT times slower per character,
+raises, or misses its time bound at the larger size: an analyzer the API cuts
+text short for must run at its floor (see FLOORS), and the Python analyzer,
+which is never cut, must return within the worker timeout.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import checkcodetype
+import copymain
+import cpp
+import java
+import javascript
+import paste
+import py
+from dispatch import ANALYZED_LENGTHS, LANGUAGE_SAMPLE_LENGTH
+from workers import DEFAULT_TIMEOUT
+
+# Minimum MB/s at four times --size: the rate at which the most text the API
+# gives the analyzer (dispatch.ANALYZED_LENGTHS) is analyzed in half the
+# worker timeout. The Python analyzer has none; it stops at its time budget.
+FLOORS = {
+    name: length / 1e6 / (DEFAULT_TIMEOUT / 2)
+    for name, length in [
+        ('language', LANGUAGE_SAMPLE_LENGTH),
+        ('java', ANALYZED_LENGTHS['java.py'][1]),
+        ('cpp', ANALYZED_LENGTHS['cpp.py'][1]),
+        ('javascript', ANALYZED_LENGTHS['javascript.py'][1]),
+        ('copy', ANALYZED_LENGTHS['copymain.py'][1]),
+        ('paste', ANALYZED_LENGTHS['paste.py'][1]),
+    ]
+}
+ANALYZERS = {
+    'language': checkcodetype.detect_language,
+    'python': lambda code: py.CodeAnalyzer(code).analyze(),
+    'java': java.detect_ai_generated_java,
+    'cpp': cpp.detect_ai_cpp_code,
+    'javascript': javascript.detect_ai_js,
+    'copy': lambda code: copymain.analyze_copied_content(code, "Two Sum"),
+    'paste': lambda code: paste.analyze_paste_suspicion({"data": code}),
+}
+# Seconds per character may grow this much from --size to four times it
+# (linear: about 1; quadratic: about 4)
+GROWTH_LIMIT = 2.5
+
+
+def repeat_to(unit, size):
+    return unit * max(1, size // len(unit))
+
+# Each input takes a size in characters and returns code of about that size
+INPUTS = {
+    'minified': lambda size: repeat_to('var a=b+c;function f(x){return g(x)*2}', size),
+    'calls': lambda size: repeat_to('f(a)g(b)', size),
+    'unclosed_block_comments': lambda size: repeat_to('/* x ', size),
+    'unclosed_strings': lambda size: repeat_to('"ab ', size),
+    'unclosed_templates': lambda size: repeat_to('`${', size),
+    'unclosed_regex_classes': lambda size: repeat_to('=/[', size),
+    'unclosed_includes': lambda size: repeat_to('#include <', size),
+    'unclosed_signatures': lambda size: repeat_to('int main(', size),
+    'whitespace_run': lambda size: 'x' + ' ' * size + 'y',
+    'nesting': lambda size: repeat_to('f(', size),
+    'closing_parens': lambda size: 'public a b(' + ')' * size,
+    'blank_lines': lambda size: repeat_to('\n ', size),
+}
+
+
+def time_analyzer(analyze, code):
+    start = time.perf_counter()
+    analyze(code)
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=65536, help="Characters per input at the smaller size (default: 65536)")
+    parser.add_argument('--only', nargs='+', choices=sorted(ANALYZERS), help="Analyzers to run (default: all)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL) # Analyzers log per call
+
+    failures = []
+    print("floors: " + ", ".join(f"{name} {floor:.3f} MB/s" for name, floor in FLOORS.items()))
+    print(f"{'input':<24} {'analyzer':<11} {'MB/s':>8} {'growth':>7}")
+    for input_name, generate in INPUTS.items():
+        small, large = generate(args.size), generate(4 * args.size)
+        for name in args.only or ANALYZERS:
+            analyze = ANALYZERS[name]
+            try:
+                small_seconds = time_analyzer(analyze, small)
+                large_seconds = time_analyzer(analyze, large)
+            except Exception as e:
+                failures.append(f"{input_name}/{name}: {type(e).__name__}: {e}")
+                print(f"{input_name:<24} {name:<11} {'error':>8}")
+                continue
+            throughput = len(large) / 1e6 / large_seconds if large_seconds else float('inf')
+            # Per-character cost at the larger size relative to the smaller one
+            growth = (large_seconds / len(large)) / (small_seconds / len(small)) if small_seconds else 1.0
+            problems = []
+            if name in FLOORS and throughput < FLOORS[name]:
+                problems.append(f"below {FLOORS[name]:.3f} MB/s")
+            elif name not in FLOORS and large_seconds > DEFAULT_TIMEOUT:
+                problems.append(f"took {large_seconds:.1f}s, over the {DEFAULT_TIMEOUT}s worker timeout")
+            if growth > GROWTH_LIMIT and large_seconds > 0.05: # Ignore noise on inputs handled in microseconds
+                problems.append(f"{growth:.1f}x slower per character")
+            if problems:
+                failures.append(f"{input_name}/{name}: {', '.join(problems)}")
+            print(f"{input_name:<24} {name:<11} {throughput:>8.2f} {growth:>6.1f}x{'  <-' if problems else ''}")
+
+    print(f"failures: {len(failures)}")
+    for failure in failures:
+        print(f"  {failure}")
+    return 0 if not failures else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Word segmentation benchmark: builds a word list, checks that the memory-mapped
+words.WordList segments identifiers exactly like an in-memory words.WordSet of
+the same words, and reports load time, segmentation throughput and memory.
+
+Usage (from the repository root):
+    python -m benchmarks.word_segmentation [--source FILE ...] [--corpus DIR]
+
+Without --source the list is built as `python words.py` builds the installed
+one, from the english-words package's lists, or from the lowercase words in the
+Python standard library's source when that package is not installed; without
+--corpus identifiers are taken from the standard library.
+"""
+
+import argparse
+import ast
+import os
+import re
+import resource
+import sys
+import sysconfig
+import tempfile
+import time
+
+import words
+from benchmarks.formatting_parity import load_directory
+
+
+def stdlib_words():
+    """Lowercase words of 2+ letters appearing in the standard library's source."""
+    found = set()
+    for _, code in load_directory(sysconfig.get_paths()["stdlib"]):
+        found.update(word.lower() for word in re.findall(r'[A-Za-z]{2,}', code))
+    return found
+
+def identifiers(corpus):
+    """Every distinct Name, argument and definition name in the corpus, in first-seen order."""
+    seen = {}
+    for _, code in corpus:
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                seen.setdefault(node.id)
+            elif isinstance(node, ast.arg):
+                seen.setdefault(node.arg)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                seen.setdefault(node.name)
+    return list(seen)
+
+def rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def time_segmentation(segmenter, names):
+    start = time.perf_counter()
+    results = [segmenter.segment(name) for name in names]
+    return results, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', nargs='+', help="Word files, one word per line (default: the installed list's sources)")
+    parser.add_argument('--corpus', help="Directory of Python files to take identifiers from (default: the standard library)")
+    args = parser.parse_args(argv)
+
+    if args.source:
+        word_set = words.read_words(args.source)
+    else:
+        try:
+            word_set = words.read_package_words()
+        except ImportError as e:
+            print(f"{e}; using the standard library's words")
+            word_set = stdlib_words()
+    corpus = load_directory(args.corpus or sysconfig.get_paths()["stdlib"])
+    names = identifiers(corpus)
+    if not word_set or not names:
+        print("No words or identifiers found.")
+        return 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "words.bin")
+        start = time.perf_counter()
+        count = words.build_word_list(word_set, path)
+        build_seconds = time.perf_counter() - start
+        print(f"words: {count}, file: {os.path.getsize(path) / 1024:.0f} KiB, built in {build_seconds * 1000:.0f} ms")
+
+        baseline_rss = rss_mb()
+        start = time.perf_counter()
+        mapped = words.load_vocabulary((), path)
+        print(f"load (mmap):  {(time.perf_counter() - start) * 1000:8.2f} ms, peak RSS +{rss_mb() - baseline_rss:.1f} MB")
+
+        start = time.perf_counter()
+        in_memory = words.WordSet(word_set)
+        print(f"load (set):   {(time.perf_counter() - start) * 1000:8.2f} ms, peak RSS +{rss_mb() - baseline_rss:.1f} MB")
+
+        mapped_segmenter = words.Segmenter(mapped)
+        mapped_results, cold = time_segmentation(mapped_segmenter, names)
+        recent = names[-words.SEGMENT_CACHE_SIZE:] # Still in the segmenter's cache
+        _, warm = time_segmentation(mapped_segmenter, recent)
+        memory_results, in_memory_seconds = time_segmentation(words.Segmenter(in_memory), names)
+
+        mismatched = [name for name, a, b in zip(names, mapped_results, memory_results) if a != b]
+        segmented = sum(result is not None for result in mapped_results)
+        print(f"identifiers: {len(names)}, made of dictionary words: {segmented}, mismatched: {len(mismatched)}")
+        for name in mismatched[:10]:
+            print(f"  {name}: {mapped_segmenter.segment(name)}")
+        print(f"segment (mmap, cold): {len(names) / cold:10.0f} identifiers/s")
+        print(f"segment (mmap, warm): {len(recent) / warm:10.0f} identifiers/s")
+        print(f"segment (set, cold):  {len(names) / in_memory_seconds:10.0f} identifiers/s")
+    return 0 if not mismatched else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import db
+
+# Get logger from main application or create a new one if imported directly
+logger = logging.getLogger("py-api.cache")
+
+# --- Configuration ---
+MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_SIZE", "1024"))
+# Set to "1" to also keep results in the RESULT_CACHE_COLLECTION Mongo collection
+PERSISTENT = os.environ.get("RESULT_CACHE_PERSISTENT", "0") == "1"
+
+
+def make_key(analyzer, version, code):
+    """
+    Cache key for one analysis: the analyzer script, its ANALYZER_VERSION and
+    the SHA-256 of the code. Bumping the version orphans every old entry.
+    """
+    digest = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+    return f"{analyzer}:{version}:{digest}"
+
+
+class ResultCache:
+    """
+    Content-hash cache for the code analyzers, which are pure functions of the
+    code string.
+
+    Results live in a bounded in-memory LRU. With `persistent` set, they are
+    also written to a Mongo collection so they survive restarts and are
+    shared between API instances; a persistent hit is promoted into memory.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, persistent=PERSISTENT):
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the cached result for key, or None. Reads the persistent tier on a memory miss."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        if self.persistent:
+            result = self._get_persistent(key)
+            if result is not None:
+                self._remember(key, result)
+                with self._lock:
+                    self.hits += 1
+                    self.persistent_hits += 1
+                return result
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, result):
+        """Caches a successful analysis result."""
+        self._remember(key, result)
+        if self.persistent:
+            self._put_persistent(key, result)
+
+    async def lookup(self, key):
+        """`get` for async callers: the persistent tier is read off the event loop."""
+        if self.persistent:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def store(self, key, result):
+        """`put` for async callers: the persistent tier is written off the event loop."""
+        if self.persistent:
+            await asyncio.to_thread(self.put, key, result)
+        else:
+            self.put(key, result)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self.persistent,
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_persistent(self, key):
+        try:
+            document = db.get_collection(db.RESULT_CACHE_COLLECTION).find_one({"_id": key}, {"result": 1})
+            return document["result"] if document else None
+        except Exception as e:
+            logger.error(f"Error reading cached result {key}: {str(e)}")
+            return None
+
+    def _put_persistent(self, key, result):
+        try:
+            db.get_collection(db.RESULT_CACHE_COLLECTION).replace_one(
+                {"_id": key},
+                {"_id": key, "result": result, "createdAt": datetime.utcnow()},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error storing cached result {key}: {str(e)}")
@@ -0,0 +1,304 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from functools import cached_property, partial
+from itertools import accumulate, compress, count, groupby, repeat
+from operator import eq, getitem, itemgetter, mul, ne, sub
+
+# --- Token Kinds ---
+# The Java, C++ and JavaScript analyzers all read their code through one lexer
+# pass. Whitespace is not a token: spacing is read off the code around a
+# token's span and indentation off its line.
+COMMENT = 'comment' # // line and /* block */ comments
+STRING = 'string' # String, character, text block and template literals
+REGEX = 'regex' # JavaScript regular expression literals
+IDENTIFIER = 'identifier' # Names and keywords
+NUMBER = 'number'
+OPERATOR = 'operator' # Operators, punctuation and any other character
+
+# What a physical line holds; a token spanning lines marks every line it touches
+CODE = 1
+LINE_COMMENT = 2
+BLOCK_COMMENT = 4
+NON_BLANK = CODE | LINE_COMMENT | BLOCK_COMMENT
+
+Token = namedtuple('Token', 'kind text start end line') # start/end: offsets into the code; line: index of the first line
+make_token = partial(tuple.__new__, Token) # Token from a tuple of its fields, without a Python-level call
+
+# --- Token Patterns ---
+# Every alternative consumes at least one character and none can backtrack
+# into another, so a lexer pass is linear in the size of the code. Unclosed
+# comments and text blocks run to the end of the code, unclosed quotes and
+# regex literals to the end of the line.
+COMMENT_RE = r'//[^\r\n]*|/\*(?:[\s\S]*?\*/|[\s\S]*)'
+DOUBLE_QUOTED_RE = r'"(?:[^"\\\r\n]|\\[\s\S])*"?'
+SINGLE_QUOTED_RE = r"'(?:[^'\\\r\n]|\\[\s\S])*'?"
+TEXT_BLOCK_RE = r'"""(?:[^\\]|\\[\s\S])*?(?:"""|\Z)'
+TEMPLATE_RE = r'`(?:[^`\\]|\\[\s\S])*`?' # ${...} substitutions are kept inside the literal
+RAW_STRING_RE = r'R"(?P<delimiter>[^()\\\s]{0,16})\((?:[\s\S]*?\)(?P=delimiter)"|[\s\S]*)'
+ENCODING_PREFIX_RE = r'(?:u8|[uUL])?'
+IDENTIFIER_RE = r'(?:[^\W\d]|\$)[\w$]*'
+# A preprocessing number: also covers suffixes (10L, 1.5f, 42n), radix prefixes and exponents
+NUMBER_RE = r"\.?\d(?:[eEpP][+-]|[\w.]{separator})*"
+
+COMMON_OPERATORS = [
+    '<<=', '>>=', '...', '->', '++', '--', '<<', '>>', '<=', '>=', '==', '!=', '&&', '||',
+    '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=',
+]
+JAVA_OPERATORS = COMMON_OPERATORS + ['>>>=', '>>>', '::']
+CPP_OPERATORS = COMMON_OPERATORS + ['->*', '<=>', '::', '.*']
+JAVASCRIPT_OPERATORS = COMMON_OPERATORS + [
+    '>>>=', '>>>', '===', '!==', '**=', '**', '&&=', '||=', '??=', '??', '?.', '=>',
+]
+
+# A '/' starts a regular expression literal, not a division, where no value
+# can end: at the start, after an operator other than ) ] } ++ -- and <, or
+# after a keyword such as return (JavaScript only). `</` is a JSX closing tag
+# far more often than a comparison with a regex. A match starts right after
+# the previous token, so the lookbehinds see that token's last characters.
+REGEX_KEYWORDS = [
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+]
+REGEX_CONTEXT_RE = r'(?:\A|(?<=[-(,=:\[!&|?{};~+*%>^])(?<!\+\+)(?<!--)|' + '|'.join(rf'(?<=\b{keyword})' for keyword in REGEX_KEYWORDS) + ')'
+# Like a quote, an unclosed regex literal or character class runs to the end
+# of the line; requiring the closer would rescan the line from every later '/['.
+REGEX_LITERAL_RE = r'/(?![*/])(?:[^/\\\[\r\n]|\\.|\[(?:[^\]\\\r\n]|\\.)*\]?)+(?:/[A-Za-z]*)?'
+
+RADIX_NUMBER_RE = re.compile(r'0(?:x([0-9a-f]+)|b([01]+)|o([0-7]+))')
+DECIMAL_NUMBER_RE = re.compile(r'(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?')
+
+# Indentation kinds, a bit per whitespace character found in a line's indent
+INDENT_SPACES = 1
+INDENT_TABS = 2
+INDENT_OTHER = 4 # Form feeds and other whitespace
+INDENT_MIXED = INDENT_SPACES | INDENT_TABS
+
+OPENING_BRACKETS = {'(': ')', '[': ']', '{': '}'}
+CLOSING_BRACKETS = frozenset(OPENING_BRACKETS.values())
+
+
+class Dialect:
+    """The literal syntax of one C-family language."""
+
+    def __init__(self, name, strings, operators, digit_separator=False, regex_literals=False):
+        """
+        Args:
+            name (str): Language name, for logs and benchmarks.
+            strings (list): Patterns of the string-like literals, tried in order.
+            operators (list): Operators longer than one character.
+            digit_separator (bool): Whether ' may separate digits (C++14).
+            regex_literals (bool): Whether '/' may start a regex literal.
+        """
+        self.name = name
+        number = NUMBER_RE.format(separator=r"|'(?=\w)" if digit_separator else '')
+        operator = '|'.join(
+            re.escape(op) + (r'(?!\d)' if op == '?.' else '') # a?.5:0 is a conditional
+            for op in sorted(operators, key=len, reverse=True))
+        pattern = (
+            rf"\s*(?:(?P<{COMMENT}>{COMMENT_RE})|(?P<{STRING}>{'|'.join(strings)})"
+            rf"|(?P<{NUMBER}>{number})|(?P<{IDENTIFIER}>{IDENTIFIER_RE})|(?P<{OPERATOR}>{operator}|\S))")
+        if regex_literals:
+            pattern = rf"{REGEX_CONTEXT_RE}\s*(?P<{REGEX}>{REGEX_LITERAL_RE})|{pattern}"
+        # One match per token; the token is the last (outermost) group that matched
+        self.pattern = re.compile(pattern)
+
+    def __repr__(self):
+        return f"Dialect({self.name!r})"
+
+
+JAVA = Dialect('Java', [TEXT_BLOCK_RE, DOUBLE_QUOTED_RE, SINGLE_QUOTED_RE], JAVA_OPERATORS)
+CPP = Dialect(
+    'C++',
+    [ENCODING_PREFIX_RE + RAW_STRING_RE, ENCODING_PREFIX_RE + DOUBLE_QUOTED_RE, ENCODING_PREFIX_RE + SINGLE_QUOTED_RE],
+    CPP_OPERATORS, digit_separator=True)
+JAVASCRIPT = Dialect(
+    'JavaScript', [DOUBLE_QUOTED_RE, SINGLE_QUOTED_RE, TEMPLATE_RE], JAVASCRIPT_OPERATORS, regex_literals=True)
+
+
+# --- Lexing ---
+
+class Source:
+    """
+    C-family code lexed in one pass: its tokens in order, plus for every
+    physical line (as str.splitlines() splits them) what the line holds and
+    which tokens start on it.
+    """
+
+    def __init__(self, code, dialect):
+        self.code = code
+        self.dialect = dialect
+        self.lines = code.splitlines()
+        self.tokens = []
+        self.line_flags = bytearray(len(self.lines)) # CODE | LINE_COMMENT | BLOCK_COMMENT per line
+        self._lex()
+
+    def _lex(self):
+        # One finditer over the code; everything per token below runs in C
+        # (map/compress/bisect), only comments and multi-line tokens are
+        # handled one by one.
+        code = self.code
+        spans = [
+            (match.lastgroup, match.start(match.lastindex), match.end())
+            for match in self.dialect.pattern.finditer(code, 0, len(code.rstrip()))
+        ]
+        if not spans:
+            return
+        kinds, starts, ends = zip(*spans)
+        line_ends = list(accumulate(map(len, code.splitlines(True)))) # Offset where each next line starts
+        firsts = list(map(bisect_right, repeat(line_ends), starts))
+        lasts = list(map(bisect_left, repeat(line_ends), ends)) # Line of each token's last character
+        texts = map(code.__getitem__, map(slice, starts, ends))
+        self.tokens = tokens = list(map(make_token, zip(kinds, texts, starts, ends, firsts)))
+
+        flags = self.line_flags
+        for line in set(compress(firsts, map(ne, kinds, repeat(COMMENT)))):
+            flags[line] = CODE
+        comments = compress(count(), map(eq, kinds, repeat(COMMENT)))
+        multi_line = compress(count(), map(ne, firsts, lasts))
+        for index in set(comments).union(multi_line):
+            kind, text, _, _, first = tokens[index]
+            if kind != COMMENT:
+                flag = CODE
+            elif text.startswith('//'):
+                flag = LINE_COMMENT
+            else:
+                flag = BLOCK_COMMENT
+            for line in range(first, lasts[index] + 1):
+                flags[line] |= flag
+
+    # --- Views ---
+
+    @cached_property
+    def line_tokens(self):
+        """The tokens starting on each line."""
+        rows = [[] for _ in self.lines]
+        for line, tokens in groupby(self.tokens, itemgetter(4)): # Token.line
+            rows[line] = list(tokens)
+        return rows
+
+    @cached_property
+    def line_metrics(self):
+        return LineMetrics(self.lines, self.line_flags)
+
+    @cached_property
+    def comments(self):
+        return [token for token in self.tokens if token.kind == COMMENT]
+
+    @cached_property
+    def code_tokens(self):
+        """Tokens other than comments, so neighbours in this list are neighbours in the code."""
+        return [token for token in self.tokens if token.kind != COMMENT]
+
+    @cached_property
+    def brackets(self):
+        """Index in code_tokens of the matching bracket for each bracket token, or -1 if unmatched."""
+        matches = [-1] * len(self.code_tokens)
+        stack = []
+        for index, token in enumerate(self.code_tokens):
+            if token.kind != OPERATOR:
+                continue
+            if token.text in OPENING_BRACKETS:
+                stack.append(index)
+            elif token.text in CLOSING_BRACKETS:
+                # Pop openers left unclosed inside this pair, e.g. the '(' of `f(a]`
+                while stack and OPENING_BRACKETS[self.code_tokens[stack[-1]].text] != token.text:
+                    stack.pop()
+                if stack:
+                    opening = stack.pop()
+                    matches[opening], matches[index] = index, opening
+        return matches
+
+    def indent(self, line):
+        """Leading whitespace of the given line."""
+        text = self.lines[line]
+        return text[:len(text) - len(text.lstrip())]
+
+    def spaced_before(self, token):
+        return token.start == 0 or self.code[token.start - 1].isspace()
+
+    def spaced_after(self, token):
+        return token.end == len(self.code) or self.code[token.end].isspace()
+
+
+# --- Line Metrics ---
+
+class LineMetrics:
+    """
+    Formatting measures of every physical line in typed arrays, computed in
+    one pass of C-level maps over the lines. The formatting factors reduce
+    these columns instead of re-reading line strings.
+    """
+
+    def __init__(self, lines, flags):
+        """
+        Args:
+            lines (list): The physical lines.
+            flags (bytearray): CODE | LINE_COMMENT | BLOCK_COMMENT per line.
+        """
+        self.flags = flags
+        self.length = array('I', map(len, lines))
+        self.content = array('I', map(len, map(str.strip, lines))) # Length without surrounding whitespace
+        self.indent = array('I', map(sub, self.length, map(len, map(str.lstrip, lines))))
+        self.trailing = array('I', map(sub, self.length, map(len, map(str.rstrip, lines))))
+        indents = list(map(getitem, lines, map(slice, self.indent)))
+        kinds = {indent: indent_kind(indent) for indent in set(indents)}
+        self.indent_kind = bytearray(map(kinds.__getitem__, indents)) # INDENT_* bits
+
+    def where(self, mask, lines=None):
+        """Indices of the lines (of the given ones, or all) whose flags share a bit with mask."""
+        flags = self.flags
+        return [line for line in (range(len(flags)) if lines is None else lines) if flags[line] & mask]
+
+    @staticmethod
+    def select(column, lines):
+        """The column's values at the given line indices."""
+        return list(map(column.__getitem__, lines))
+
+
+def indent_kind(indent):
+    """INDENT_* bits of the whitespace characters in indent."""
+    kind = 0
+    for char in set(indent):
+        kind |= INDENT_SPACES if char == ' ' else INDENT_TABS if char == '\t' else INDENT_OTHER
+    return kind
+
+def moments(values):
+    """
+    Args:
+        values (list): Integers, e.g. a selection of a LineMetrics column.
+
+    Returns:
+        tuple: (count, mean, sample variance) from the exact integer sum and
+               sum of squares; the variance is None for fewer than two values.
+    """
+    count = len(values)
+    if not count:
+        return 0, None, None
+    total = sum(values)
+    if count < 2:
+        return count, total / count, None
+    squares = sum(map(mul, values, values))
+    return count, total / count, (count * squares - total * total) / (count * (count - 1))
+
+
+# --- Literals ---
+
+def number_value(text):
+    """
+    Args:
+        text (str): A NUMBER token.
+
+    Returns:
+        float: The literal's value, ignoring separators and type suffixes, or
+               None if it is not a well-formed number.
+    """
+    text = text.replace('_', '').replace("'", '').lower()
+    match = RADIX_NUMBER_RE.match(text)
+    if match:
+        for base, digits in zip((16, 2, 8), match.groups()):
+            if digits:
+                return float(int(digits, base))
+    match = DECIMAL_NUMBER_RE.match(text)
+    return float(match.group()) if match else None
@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+
+# pymongo (and bson with it) is imported on first use, so that importing this
+# module - as every analyzer's command-line entry point does - costs nothing
+# until a document is actually read or written
+
+# Get logger from main application or create a new one if imported directly
+logger = logging.getLogger("py-api.db")
+
+# --- Configuration ---
+# Everything can be overridden from the environment. MONGODB_URI has no
+# default: it carries the database credentials, so it must be provided by the
+# deployment and is checked before the first connection (see require_uri).
+MONGODB_URI = os.environ.get("MONGODB_URI")
+DATABASE_NAME = os.environ.get("MONGODB_DATABASE", "test")
+MAX_POOL_SIZE = int(os.environ.get("MONGODB_MAX_POOL_SIZE", "20"))
+MIN_POOL_SIZE = int(os.environ.get("MONGODB_MIN_POOL_SIZE", "0"))
+SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+CONNECT_TIMEOUT_MS = int(os.environ.get("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+
+ACTIVITIES_COLLECTION = "activities"
+AIRESPONSE_COLLECTION = "airesponse"
+RESULT_CACHE_COLLECTION = os.environ.get("RESULT_CACHE_COLLECTION", "analysiscache")
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def require_uri():
+    """
+    Returns MONGODB_URI.
+
+    Raises:
+        RuntimeError: If MONGODB_URI is not set in the environment.
+    """
+    if not MONGODB_URI:
+        raise RuntimeError("MONGODB_URI is not set; export the MongoDB connection string "
+                           "(mongodb+srv://<user>:<password>@<host>/...) before starting the service")
+    return MONGODB_URI
+
+def get_client():
+    """
+    Returns the process-wide MongoClient, creating it on first use.
+
+    MongoClient keeps its own connection pool and is thread-safe, so one
+    instance per process is shared by every request. A forked child gets a
+    fresh client because pymongo clients must not cross a fork.
+
+    Raises:
+        RuntimeError: If MONGODB_URI is not set.
+    """
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                uri = require_uri()
+                from pymongo import MongoClient
+                logger.info("Creating MongoDB client")
+                _client = MongoClient(
+                    uri,
+                    maxPoolSize=MAX_POOL_SIZE,
+                    minPoolSize=MIN_POOL_SIZE,
+                    serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+                    connectTimeoutMS=CONNECT_TIMEOUT_MS,
+                )
+                _client_pid = os.getpid()
+    return _client
+
+def close_client():
+    """Closes the process-wide client, if one was created."""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+def get_database():
+    return get_client()[DATABASE_NAME]
+
+def get_collection(name):
+    return get_database()[name]
+
+
+# --- Repository Functions ---
+
+def fetch_document_by_id(document_id, projection=None):
+    """
+    Fetches one activity document by its _id.
+
+    Args:
+        document_id (str): The _id as a hex string.
+        projection (dict, optional): Fields to return. Defaults to the whole document.
+
+    Returns:
+        dict: The document, or None if it does not exist or could not be read.
+    """
+    from bson.objectid import ObjectId
+    try:
+        logger.info(f"Fetching document with ID: {document_id}")
+        document = get_collection(ACTIVITIES_COLLECTION).find_one({"_id": ObjectId(document_id)}, projection)
+        if document:
+            logger.info(f"Document found for ID: {document_id}")
+            return document
+        else:
+            logger.warning(f"No document found with _id: {document_id}")
+            return None
+    except Exception as e:
+        logger.error(f"Error fetching document with ID {document_id}: {str(e)}")
+        return None
+
+def fetch_documents_by_ids(document_ids, projection=None):
+    """
+    Fetches many activity documents with a single `$in` query.
+
+    Args:
+        document_ids (list): _id hex strings. Invalid ids are skipped.
+        projection (dict, optional): Fields to return. Defaults to whole documents.
+
+    Returns:
+        dict: Documents keyed by their _id string. Missing ids are simply absent;
+              an empty dict is returned if the query fails.
+    """
+    from bson.objectid import ObjectId
+    object_ids = list({ObjectId(document_id) for document_id in document_ids if ObjectId.is_valid(document_id)})
+    if not object_ids:
+        return {}
+    try:
+        logger.info(f"Fetching {len(object_ids)} documents")
+        cursor = get_collection(ACTIVITIES_COLLECTION).find({"_id": {"$in": object_ids}}, projection)
+        documents = {str(document["_id"]): document for document in cursor}
+        logger.info(f"Found {len(documents)} of {len(object_ids)} documents")
+        return documents
+    except Exception as e:
+        logger.error(f"Error fetching {len(object_ids)} documents: {str(e)}")
+        return {}
+
+def insert_ai_responses(response_docs):
+    """Inserts many documents into the airesponse collection and returns their _ids."""
+    return get_collection(AIRESPONSE_COLLECTION).insert_many(response_docs, ordered=False).inserted_ids
@@ -0,0 +1,174 @@
+import logging
+import os
+
+import paste
+import copymain
+import keymain
+import tab
+import py
+import java
+import cpp
+import javascript
+from checkcodetype import Language
+from db import fetch_document_by_id
+
+# Get logger from main application or create a new one if imported directly
+logger = logging.getLogger("py-api.dispatch")
+
+
+class AnalysisError(Exception):
+    """Raised when an analyzer cannot produce a result for a document."""
+
+
+# --- Analyzer Adapters ---
+# Each adapter takes the activity document fetched by the API and returns the
+# same dict the script's `__main__` block would print as JSON. Results are
+# passed on as objects; main.py serializes them once for the HTTP response.
+
+def _run_paste(document):
+    return paste.analyze_paste_suspicion(document)
+
+def _run_copy(document):
+    return copymain.analyze_copy_event(document)
+
+def _run_key(document):
+    return keymain.SuspiciousBehaviorDetector().analyze(document)
+
+def _run_tab(document):
+    if document.get("eventType") not in TAB_EVENT_TYPES:
+        raise AnalysisError(f"Document {document.get('_id')} is not a 'tab_switch' event (eventType: {document.get('eventType')})")
+    return tab.analyze_tab_switch(document)
+
+def _run_py(document):
+    return py.CodeAnalyzer(document['code']).analyze()
+
+def _run_java(document):
+    return java.detect_ai_generated_java(document['code'])
+
+def _run_cpp(document):
+    return cpp.detect_ai_cpp_code(document['code'])
+
+def _run_javascript(document):
+    return javascript.detect_ai_js(document['code'])
+
+
+TAB_EVENT_TYPES = ["tab_switch", "tab_deactivated", "tab_activated", "window_blurred", "window_focused", "url_change"]
+
+# --- Projections ---
+# Only the fields each analyzer reads are fetched from `activities`.
+CODE_PROJECTION = {"code": 1}
+PASTE_PROJECTION = {"data": 1}
+COPY_PROJECTION = {field: 1 for field in ["eventType", "data", "problemTitle", "problemName", "page", "contentLength", "username", "timestamp"]}
+KEY_PROJECTION = {"keyLogs": 1, keymain.PACKED_KEY_LOGS_FIELD: 1}
+TAB_PROJECTION = {field: 1 for field in ["eventType", "username", "problemId", "problemTitle", "platform", "timestamp", "fromUrl", "fromTitle", "toUrl", "toTitle"]}
+
+# --- Registry ---
+# script name accepted by /execute -> (event type, projection, adapter)
+ANALYZERS = {
+    "paste.py": ("paste", PASTE_PROJECTION, _run_paste),
+    "copymain.py": ("copy", COPY_PROJECTION, _run_copy),
+    "keymain.py": ("key", KEY_PROJECTION, _run_key),
+    "tab.py": ("tab", TAB_PROJECTION, _run_tab),
+    "py.py": ("code", CODE_PROJECTION, _run_py),
+    "java.py": ("code", CODE_PROJECTION, _run_java),
+    "cpp.py": ("code", CODE_PROJECTION, _run_cpp),
+    "javascript.py": ("code", CODE_PROJECTION, _run_javascript),
+}
+
+# --- Limits ---
+# Characters of text an analyzer is given, for the analyzers whose time is not
+# otherwise bounded: script name -> (free-text field, length). Longer text is
+# cut to that length rather than rejected, since the largest pastes are the
+# most suspicious, and the result reports how many characters were left out
+# ("truncated_characters"). Each length is what the analyzer gets through in
+# half the worker timeout (workers.DEFAULT_TIMEOUT) at its slowest rate in
+# benchmarks.regex_throughput, noted alongside. py.py is not cut: it samples
+# long inputs itself and skips what does not fit its time budget
+# (py.FULL_ANALYSIS_MAX_LINES, py.ANALYSIS_BUDGET).
+ANALYZED_LENGTHS = {
+    "paste.py": ("data", 4 * 1024 * 1024), # 1.6 MB/s
+    "copymain.py": ("data", 4 * 1024 * 1024), # 1.8 MB/s
+    "java.py": ("code", 768 * 1024), # 0.19 MB/s
+    "cpp.py": ("code", 512 * 1024), # 0.17 MB/s
+    "javascript.py": ("code", 384 * 1024), # 0.11 MB/s
+}
+# Characters of code checkcodetype.detect_language reads (0.21 MB/s): a prefix
+# this long identifies the language as well as the whole code does
+LANGUAGE_SAMPLE_LENGTH = 64 * 1024
+
+# Language reported by checkcodetype.detect_language -> script that analyzes it
+LANGUAGE_SCRIPTS = {
+    Language.JAVA: 'java.py',
+    Language.PYTHON: 'py.py',
+    Language.CPP: 'cpp.py',
+    Language.JAVASCRIPT: 'javascript.py',
+}
+
+# Code analyzer script -> version its results are cached under (see cache.py)
+ANALYZER_VERSIONS = {
+    'py.py': py.ANALYZER_VERSION,
+    'java.py': java.ANALYZER_VERSION,
+    'cpp.py': cpp.ANALYZER_VERSION,
+    'javascript.py': javascript.ANALYZER_VERSION,
+}
+
+
+def get_event_type(script_name):
+    """Returns the event type handled by a registered script."""
+    return ANALYZERS[script_name][0]
+
+def get_projection(script_name):
+    """Returns the `activities` fields a registered script needs."""
+    return ANALYZERS[script_name][1]
+
+def fetch_document(script_name, object_id):
+    """
+    Fetches the activity document for a registered script, projected to the
+    fields its analyzer reads.
+
+    Raises:
+        AnalysisError: If no document exists for object_id.
+    """
+    document = fetch_document_by_id(object_id, get_projection(script_name))
+    if not document:
+        raise AnalysisError(f"Document not found for ID: {object_id}")
+    return document
+
+def truncate_document(script_name, document):
+    """
+    Cuts the script's free-text field to its ANALYZED_LENGTHS entry.
+
+    Returns:
+        tuple: (document, or a copy of it with the text cut; number of characters cut)
+    """
+    field, length = ANALYZED_LENGTHS.get(script_name, (None, None))
+    text = document.get(field) if field else None
+    if not isinstance(text, str) or len(text) <= length:
+        return document, 0
+    logger.warning(f"Document {document.get('_id')} has {len(text)} characters of {field}; "
+                   f"{script_name} analyzes the first {length}")
+    return {**document, field: text[:length]}, len(text) - length
+
+def run_analyzer(script_name, document):
+    """
+    Runs a registered analyzer in the current process.
+
+    Args:
+        script_name (str): A key of ANALYZERS, e.g. 'paste.py'.
+        document (dict): The activity document to analyze, as returned by fetch_document.
+
+    Returns:
+        dict: The analysis result, identical to the JSON the script prints.
+
+    Raises:
+        AnalysisError: If the analyzer cannot handle the document or returns nothing.
+    """
+    adapter = ANALYZERS[script_name][2]
+    logger.info(f"Running {script_name} in-process for document: {document.get('_id')}")
+    document, truncated = truncate_document(script_name, document)
+    result = adapter(document)
+    if result is None:
+        raise AnalysisError("Analysis could not be performed on the document.")
+    if truncated:
+        result["truncated_characters"] = truncated
+    return result
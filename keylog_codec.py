@@ -0,0 +1,210 @@
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from operator import sub
+
+# --- Format ---
+# A session's key logs in one binary value, stored in MongoDB as a BSON binary
+# field next to (or instead of) the `keyLogs` array:
+#
+# HEADER (magic, number of logs N, timestamp exponent E, number of distinct
+# keys K, delta width W, number of wide deltas X), then the K distinct keys,
+# each as a varint byte length and UTF-8, then N key codes (indices into the
+# distinct keys: one byte each when K <= 256, otherwise uint16 or uint32).
+#
+# With E >= 0 the timestamps follow as the integers round(timestamp * 10**E),
+# delta-encoded: N unsigned deltas from the value before (the first from 0) of
+# W bytes each, then X int64 for the deltas that do not fit - negative ones
+# (logs out of order) or those of 2**(8W) - 1 and up, which are written as
+# that escape value in the W-byte stream. The encoder picks the W in WIDTHS that
+# makes the whole smallest, so ordinary typing at millisecond resolution takes
+# two bytes per key. With E = RAW_TIMESTAMPS (no exponent up to MAX_DECIMALS
+# represents every timestamp exactly) they are N float64 instead, and W = X = 0.
+#
+# Everything is little-endian, and logs keep their order. Decoding needs no
+# per-byte work in Python: each stream is read with array.frombytes and summed
+# with accumulate.
+MAGIC = b"KLG1"
+HEADER = struct.Struct("<4sIbIBI")
+MAX_DECIMALS = 6
+RAW_TIMESTAMPS = -1
+WIDTHS = {1: 'B', 2: 'H', 4: 'I'}
+
+
+def _code_typecode(key_count):
+    return 'B' if key_count <= 1 << 8 else 'H' if key_count <= 1 << 16 else 'I'
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _append_varint(out, value):
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _scaled_timestamps(timestamps):
+    """
+    Returns:
+        tuple: (the smallest E <= MAX_DECIMALS for which every timestamp is
+               exactly round(t * 10**E) / 10**E, with those integers), or
+               (RAW_TIMESTAMPS, None) if there is none or they would not fit in
+               an int64 delta.
+    """
+    for exponent in range(MAX_DECIMALS + 1):
+        scale = 10 ** exponent
+        try:
+            values = [round(timestamp * scale) for timestamp in timestamps]
+        except (ValueError, OverflowError): # NaN or infinite timestamps
+            return RAW_TIMESTAMPS, None
+        if all(value / scale == timestamp for value, timestamp in zip(values, timestamps)):
+            if values and max(map(abs, values)) >= 1 << 62:
+                return RAW_TIMESTAMPS, None
+            return exponent, values
+    return RAW_TIMESTAMPS, None
+
+def _wide(delta, escape):
+    return not 0 <= delta < escape
+
+
+# --- Encoding ---
+
+def encode_key_logs(key_logs):
+    """
+    Packs key logs into the compact binary format.
+
+    Args:
+        key_logs (list): Key log dictionaries with a 'timestamp' (a number or
+            numeric string, in milliseconds) and a 'key' string.
+
+    Returns:
+        bytes: The packed logs; decode_key_logs gives back the same timestamps
+               (as floats) and keys, in the same order.
+
+    Raises:
+        ValueError, TypeError, KeyError: If a timestamp is missing or not a
+            number, or a key is not a string.
+    """
+    timestamps = [float(log['timestamp']) for log in key_logs]
+    names = {}
+    codes = [names.setdefault(log.get('key', ''), len(names)) for log in key_logs]
+    if not all(isinstance(name, str) for name in names):
+        raise TypeError("key log keys must be strings")
+    exponent, values = _scaled_timestamps(timestamps)
+    if exponent == RAW_TIMESTAMPS:
+        width, deltas, wide = 0, None, []
+    else:
+        deltas = list(map(sub, values, [0, *values[:-1]]))
+        # The width that makes the deltas smallest, counting 8 bytes for each that does not fit
+        sizes = {}
+        for width in WIDTHS:
+            escape = (1 << 8 * width) - 1
+            sizes[width] = len(deltas) * width + 8 * sum(1 for delta in deltas if _wide(delta, escape))
+        width = min(sizes, key=sizes.get)
+        escape = (1 << 8 * width) - 1
+        wide = [delta for delta in deltas if _wide(delta, escape)]
+
+    out = bytearray(HEADER.pack(MAGIC, len(key_logs), exponent, len(names), width, len(wide)))
+    for name in names:
+        encoded = name.encode('utf-8')
+        _append_varint(out, len(encoded))
+        out += encoded
+    out += _little_endian(array(_code_typecode(len(names)), codes))
+    if exponent == RAW_TIMESTAMPS:
+        out += _little_endian(array('d', timestamps))
+    else:
+        out += _little_endian(array(WIDTHS[width], [escape if _wide(delta, escape) else delta for delta in deltas]))
+        out += _little_endian(array('q', wide))
+    return bytes(out)
+
+
+# --- Decoding ---
+
+def decode_key_logs(data):
+    """
+    Unpacks key logs straight into typed columns.
+
+    Args:
+        data (bytes): Logs packed by encode_key_logs.
+
+    Returns:
+        tuple: (timestamps as array('d') in milliseconds, key codes as an array of
+               unsigned ints, the distinct keys the codes index), in logged order.
+
+    Raises:
+        ValueError: If data is not valid packed key logs.
+    """
+    data = memoryview(data).cast('B')
+    try:
+        magic, count, exponent, key_count, width, wide_count = HEADER.unpack_from(data)
+    except struct.error as e:
+        raise ValueError(f"Truncated key log header: {e}") from None
+    if magic != MAGIC:
+        raise ValueError(f"Not packed key logs (magic {bytes(magic)!r})")
+    position = HEADER.size
+
+    names = []
+    for _ in range(key_count):
+        length, position = _read_varint(data, position)
+        if position + length > len(data):
+            raise ValueError("Truncated key dictionary")
+        try:
+            names.append(str(data[position:position + length], 'utf-8'))
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Invalid key in the key dictionary: {e}") from None
+        position += length
+
+    codes, position = _read_array(data, position, _code_typecode(key_count), count)
+    if count and max(codes) >= key_count:
+        raise ValueError("Key code outside the key dictionary")
+
+    if exponent == RAW_TIMESTAMPS:
+        timestamps, position = _read_array(data, position, 'd', count)
+    elif 0 <= exponent <= MAX_DECIMALS and width in WIDTHS:
+        deltas, position = _read_array(data, position, WIDTHS[width], count)
+        wide, position = _read_array(data, position, 'q', wide_count)
+        escape = (1 << 8 * width) - 1
+        if deltas.count(escape) != wide_count:
+            raise ValueError(f"Expected {wide_count} wide timestamp deltas, found {deltas.count(escape)}")
+        if wide_count:
+            # Put each wide delta in place of the next escape value
+            deltas = deltas.tolist()
+            index = -1
+            for delta in wide:
+                index = deltas.index(escape, index + 1)
+                deltas[index] = delta
+        scale = 10 ** exponent
+        if scale == 1:
+            timestamps = array('d', accumulate(deltas))
+        else:
+            timestamps = array('d', [value / scale for value in accumulate(deltas)])
+    else:
+        raise ValueError(f"Unknown timestamp encoding (exponent {exponent}, width {width})")
+    if position != len(data):
+        raise ValueError(f"{len(data) - position} bytes after the timestamps")
+    return timestamps, codes, names
+
+def _read_array(data, position, typecode, count):
+    values = array(typecode)
+    end = position + count * values.itemsize
+    if end > len(data):
+        raise ValueError(f"Truncated key logs: {count} values of type {typecode!r} do not fit")
+    values.frombytes(data[position:end])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values, end
+
+def _read_varint(data, position):
+    value = shift = 0
+    while position < len(data):
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+    raise ValueError("Truncated varint")
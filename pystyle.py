@@ -0,0 +1,945 @@
+# pystyle.py - PEP 8 checks for the Python analyzer
+#
+# Parts of this module - the token and operator tables under Configuration,
+# expand_indent and mute_string, and the physical and logical line checks -
+# are ported from pycodestyle 2.15.0 (https://github.com/PyCQA/pycodestyle)
+# and adapted to count violations per code instead of reporting them. Those
+# parts are used under pycodestyle's license:
+#
+# Copyright (C) 2006-2009 Johann C. Rocholl <johann@rocholl.net>
+# Copyright (C) 2009-2014 Florent Xicluna <florent.xicluna@gmail.com>
+# Copyright (C) 2014-2020 Ian Lee <IanLee1521@gmail.com>
+#
+# Licensed under the terms of the Expat License
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import importlib.util
+import keyword
+import re
+import tokenize
+from collections import Counter
+
+# pycodestyle is only needed for the reference mode, so it is imported there
+# (see reference_violations) rather than by every process that scores Python
+PYCODESTYLE_AVAILABLE = importlib.util.find_spec('pycodestyle') is not None
+
+# --- Configuration ---
+# The checks below follow pycodestyle's defaults for the categories the
+# Python analyzer scores: indentation (E1), whitespace (E2), blank lines (E3),
+# line length (E5) and warnings (W). E4/E7/E9 and the codes pycodestyle
+# ignores by default are not reported. W292/W391 are left out as well: the
+# analyzer strips the snippet, so its end-of-file newlines are meaningless.
+CATEGORIES = ('E1', 'E2', 'E3', 'E5', 'W')
+EXCLUDED_CODES = ('W292', 'W391')
+DEFAULT_IGNORE = ('E121', 'E123', 'E126', 'E226', 'E24', 'E704', 'W503', 'W504')
+MAX_LINE_LENGTH = 79
+INDENT_SIZE = 4
+TOP_LEVEL_BLANK_LINES = 2
+METHOD_BLANK_LINES = 1
+# Tokens read between calls to a checker's checkpoint (see StyleChecker)
+CHECKPOINT_INTERVAL = 4096
+
+SINGLETONS = frozenset(['False', 'None', 'True'])
+KEYWORDS = frozenset(keyword.kwlist + ['print']) - SINGLETONS
+UNARY_OPERATORS = frozenset(['>>', '**', '*', '+', '-'])
+ARITHMETIC_OP = frozenset(['**', '*', '/', '//', '+', '-', '@'])
+WS_OPTIONAL_OPERATORS = ARITHMETIC_OP.union(['^', '&', '|', '<<', '>>', '%'])
+WS_NEEDED_OPERATORS = frozenset([
+    '**=', '*=', '/=', '//=', '+=', '-=', '!=', '<', '>',
+    '%=', '^=', '&=', '|=', '==', '<=', '>=', '<<=', '>>=', '=',
+    'and', 'in', 'is', 'or', '->', ':='])
+WHITESPACE = frozenset(' \t\xa0')
+NEWLINE = frozenset([tokenize.NL, tokenize.NEWLINE])
+SKIP_TOKENS = NEWLINE.union([tokenize.INDENT, tokenize.DEDENT])
+SKIP_COMMENTS = SKIP_TOKENS.union([tokenize.COMMENT, tokenize.ERRORTOKEN])
+VALID_ESCAPES = frozenset('\n\\\'"abfnrtv01234567xNuU')
+
+# f-strings (3.12+) and t-strings (3.14+) are tokenized in parts; -1 never matches a token type
+FSTRING_START = getattr(tokenize, 'FSTRING_START', -1)
+FSTRING_MIDDLE = getattr(tokenize, 'FSTRING_MIDDLE', -1)
+FSTRING_END = getattr(tokenize, 'FSTRING_END', -1)
+TSTRING_START = getattr(tokenize, 'TSTRING_START', -1)
+TSTRING_MIDDLE = getattr(tokenize, 'TSTRING_MIDDLE', -1)
+TSTRING_END = getattr(tokenize, 'TSTRING_END', -1)
+STRING_STARTS = frozenset([tokenize.STRING, FSTRING_START, TSTRING_START])
+STRING_MIDDLES = frozenset([tokenize.STRING, FSTRING_MIDDLE, TSTRING_MIDDLE])
+STRING_ENDS = frozenset([tokenize.STRING, FSTRING_END, TSTRING_END])
+
+INDENT_RE = re.compile(r'([ \t]*)')
+DOCSTRING_RE = re.compile(r'u?r?["\']')
+EXTRANEOUS_WHITESPACE_RE = re.compile(r'[\[({][ \t]|[ \t][\]}),;:](?!=)')
+WHITESPACE_AFTER_DECORATOR_RE = re.compile(r'@\s')
+# The leading whitespace is taken from the start of its run only, so a long
+# run not followed by a keyword is scanned once rather than from every position
+# in it (a match can only start mid-run right at the keyword, after the run
+# was consumed by the previous match's trailing group).
+KEYWORD_RE = re.compile(r'((?<!\s)\s*|)\b(?:%s)\b(\s*)' % r'|'.join(KEYWORDS))
+OPERATOR_RE = re.compile(r'(?:[^,\s])(\s*)(?:[-+*/|!<=>%&^]+|:=)(\s*)')
+STARTSWITH_DEF_RE = re.compile(r'^(async\s+def|def)\b')
+STARTSWITH_GENERIC_RE = re.compile(r'^(async\s+def|def|class|type)\s+\w+\[')
+STARTSWITH_TOP_LEVEL_RE = re.compile(r'^(async\s+def\s+|def\s+|class\s+|@)')
+NOQA_RE = re.compile(r'# no(?:qa|pep8)\b', re.I)
+
+
+# --- Helper Functions ---
+
+def physical_lines(code):
+    """Splits code into lines the way the tokenizer reads them (on '\\n' only, keeping line ends)."""
+    lines = code.split('\n')
+    last = lines.pop()
+    lines = [line + '\n' for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+def expand_indent(line):
+    """Returns the amount of indentation, expanding tabs to the next multiple of 8."""
+    line = line.rstrip('\n\r')
+    if '\t' not in line:
+        return len(line) - len(line.lstrip())
+    result = 0
+    for char in line:
+        if char == '\t':
+            result = result // 8 * 8 + 8
+        elif char == ' ':
+            result += 1
+        else:
+            break
+    return result
+
+def mute_string(text):
+    """Replaces string contents with 'xxx' so logical-line checks don't match inside them."""
+    start = text.index(text[-1]) + 1
+    end = len(text) - 1
+    if text[-3:] in ('"""', "'''"):
+        start += 2
+        end -= 2
+    return text[:start] + 'x' * (end - start) + text[end:]
+
+def is_reported(code):
+    return not code.startswith(DEFAULT_IGNORE)
+
+
+# --- Physical Line Checks ---
+
+def check_physical_line(line, line_number, indent_char, multiline, noqa):
+    """
+    Checks one physical line.
+
+    Returns:
+        list: Codes found on the line (E101, W191, W291, W293, E501).
+    """
+    codes = []
+    indent = INDENT_RE.match(line).group(1)
+    for char in indent:
+        if char != indent_char:
+            codes.append('E101')
+            break
+    if '\t' in indent:
+        codes.append('W191')
+
+    stripped_eol = line.rstrip('\n\r\x0c')
+    stripped = stripped_eol.rstrip(' \t\v')
+    if stripped_eol != stripped:
+        codes.append('W291' if stripped else 'W293')
+
+    line = line.rstrip()
+    if len(line) > MAX_LINE_LENGTH and not noqa:
+        chunks = line.split()
+        if line_number == 1 and line.startswith('#!'):
+            pass # Long shebang lines are fine
+        elif ((len(chunks) == 1 and multiline) or (len(chunks) == 2 and chunks[0] == '#')) and \
+                len(line) - len(chunks[-1]) < MAX_LINE_LENGTH - 7:
+            pass # Long URLs in docstrings or comments
+        else:
+            codes.append('E501')
+    return codes
+
+
+# --- Logical Line Checks ---
+# Each check takes a LogicalLine and yields codes.
+
+class LogicalLine:
+    """A logical line with the state the checks read, as pycodestyle builds it."""
+
+    __slots__ = ('text', 'tokens', 'noqa', 'line_number', 'indent_level', 'indent_char',
+                 'previous_logical', 'previous_indent_level', 'previous_unindented_logical_line',
+                 'blank_lines', 'blank_before', 'lines', 'line_before')
+
+
+def _is_one_liner(line):
+    if not STARTSWITH_TOP_LEVEL_RE.match(line.text):
+        return False
+    lines = line.lines
+    line_idx = line.line_number - 1
+    prev_indent = expand_indent(lines[line_idx - 1] if line_idx >= 1 else line.line_before)
+    if prev_indent > line.indent_level:
+        return False
+
+    while line_idx < len(lines):
+        text = lines[line_idx].strip()
+        if not text.startswith('@') and STARTSWITH_TOP_LEVEL_RE.match(text):
+            break
+        line_idx += 1
+    else:
+        return False # EOF while searching for def/class
+
+    next_idx = line_idx + 1
+    while next_idx < len(lines):
+        if lines[next_idx].strip():
+            break
+        next_idx += 1
+    else:
+        return True # Last line in the file
+    return expand_indent(lines[next_idx]) <= line.indent_level
+
+def blank_lines(line):
+    """E301-E306: blank lines around definitions."""
+    if not line.previous_logical and line.blank_before < TOP_LEVEL_BLANK_LINES:
+        return # No blank lines expected before the first line
+    if line.previous_logical.startswith('@'):
+        if line.blank_lines:
+            yield 'E304'
+    elif line.blank_lines > TOP_LEVEL_BLANK_LINES or (line.indent_level and line.blank_lines == METHOD_BLANK_LINES + 1):
+        yield 'E303'
+    elif STARTSWITH_TOP_LEVEL_RE.match(line.text):
+        if _is_one_liner(line) and line.blank_before == 0:
+            return # A group of one-liners
+        if line.indent_level:
+            if not (line.blank_before == METHOD_BLANK_LINES or
+                    line.previous_indent_level < line.indent_level or
+                    DOCSTRING_RE.match(line.previous_logical)):
+                ancestor_level = line.indent_level
+                nested = False
+                # Search backwards for a def ancestor or the top level
+                for text in line.lines[line.line_number - TOP_LEVEL_BLANK_LINES::-1]:
+                    if text.strip() and expand_indent(text) < ancestor_level:
+                        ancestor_level = expand_indent(text)
+                        nested = STARTSWITH_DEF_RE.match(text.lstrip())
+                        if nested or ancestor_level == 0:
+                            break
+                yield 'E306' if nested else 'E301'
+        elif line.blank_before != TOP_LEVEL_BLANK_LINES:
+            yield 'E302'
+    elif (line.text and not line.indent_level and line.blank_before != TOP_LEVEL_BLANK_LINES and
+            line.previous_unindented_logical_line.startswith(('def ', 'class '))):
+        yield 'E305'
+
+def extraneous_whitespace(line):
+    """E201-E204: whitespace inside brackets, before punctuation and after '@'."""
+    text = line.text
+    for match in EXTRANEOUS_WHITESPACE_RE.finditer(text):
+        found = match.group()
+        if found[-1].isspace():
+            yield 'E201'
+        elif text[match.start() - 1] != ',':
+            yield 'E202' if found.strip() in '}])' else 'E203'
+    if WHITESPACE_AFTER_DECORATOR_RE.match(text):
+        yield 'E204'
+
+def whitespace_around_keywords(line):
+    """E271-E274: spacing around keywords."""
+    for match in KEYWORD_RE.finditer(line.text):
+        before, after = match.groups()
+        if '\t' in before:
+            yield 'E274'
+        elif len(before) > 1:
+            yield 'E272'
+        if '\t' in after:
+            yield 'E273'
+        elif len(after) > 1:
+            yield 'E271'
+
+def missing_whitespace_after_keyword(line):
+    """E275: keyword directly followed by a token."""
+    tokens = line.tokens
+    for tok0, tok1 in zip(tokens, tokens[1:]):
+        if (tok0.end == tok1.start and
+                tok0.type == tokenize.NAME and
+                keyword.iskeyword(tok0.string) and
+                tok0.string not in SINGLETONS and
+                not (tok0.string == 'except' and tok1.string == '*') and
+                not (tok0.string == 'yield' and tok1.string == ')') and
+                (tok1.string and tok1.string != ':' and tok1.string != '\n')):
+            yield 'E275'
+
+def indentation(line):
+    """E111-E117: indentation of the logical line."""
+    c = 0 if line.text else 3
+    if line.indent_level % INDENT_SIZE:
+        yield 'E11%d' % (1 + c)
+    indent_expect = line.previous_logical.endswith(':')
+    if indent_expect and line.indent_level <= line.previous_indent_level:
+        yield 'E11%d' % (2 + c)
+    elif not indent_expect and line.indent_level > line.previous_indent_level:
+        yield 'E11%d' % (3 + c)
+    if indent_expect:
+        expected_indent_amount = 8 if line.indent_char == '\t' else 4
+        if line.indent_level > line.previous_indent_level + expected_indent_amount:
+            yield 'E117'
+
+def continued_indentation(line):
+    """E12x: continuation line indentation."""
+    tokens = line.tokens
+    first_row = tokens[0][2][0]
+    nrows = 1 + tokens[-1][2][0] - first_row
+    if line.noqa or nrows == 1:
+        return
+
+    indent_level = line.indent_level
+    indent_next = line.text.endswith(':')
+    row = depth = 0
+    valid_hangs = (INDENT_SIZE,) if line.indent_char != '\t' else (INDENT_SIZE, INDENT_SIZE * 2)
+    parens = [0] * nrows # Brackets opened on each row
+    rel_indent = [0] * nrows # Relative indent of each row
+    open_rows = [[0]] # Opening rows per depth
+    hangs = [None] # Hanging indent per depth
+    indent_chances = {}
+    last_indent = tokens[0][2]
+    visual_indent = None
+    last_token_multiline = False
+    indent = [last_indent[1]] # Visual indent column per depth
+    hang = 0
+    physical = ''
+
+    for token_type, text, start, end, physical in tokens:
+        newline = row < start[0] - first_row
+        if newline:
+            row = start[0] - first_row
+            newline = not last_token_multiline and token_type not in NEWLINE
+
+        if newline:
+            # The beginning of a continuation line
+            last_indent = start
+            rel_indent[row] = expand_indent(physical) - indent_level
+            close_bracket = (token_type == tokenize.OP and text in ']})')
+
+            for open_row in reversed(open_rows[depth]):
+                hang = rel_indent[row] - rel_indent[open_row]
+                hanging_indent = hang in valid_hangs
+                if hanging_indent:
+                    break
+            if hangs[depth]:
+                hanging_indent = (hang == hangs[depth])
+            visual_indent = (not close_bracket and hang > 0 and indent_chances.get(start[1]))
+
+            if close_bracket and indent[depth]:
+                if start[1] != indent[depth]:
+                    yield 'E124'
+            elif close_bracket and not hang:
+                pass # E133 only applies with hang-closing
+            elif indent[depth] and start[1] < indent[depth]:
+                if visual_indent is not True:
+                    yield 'E128'
+            elif hanging_indent or (indent_next and rel_indent[row] == 2 * INDENT_SIZE):
+                if close_bracket:
+                    yield 'E123'
+                hangs[depth] = hang
+            elif visual_indent is True:
+                indent[depth] = start[1]
+            elif visual_indent in (text, str):
+                pass # Lined up with a matching token on a previous line
+            else:
+                if hang <= 0:
+                    yield 'E122'
+                elif indent[depth]:
+                    yield 'E127'
+                elif not close_bracket and hangs[depth]:
+                    yield 'E131'
+                else:
+                    hangs[depth] = hang
+                    yield 'E126' if hang > INDENT_SIZE else 'E121'
+
+        # Look for visual indenting
+        if parens[row] and token_type not in (tokenize.NL, tokenize.COMMENT) and not indent[depth]:
+            indent[depth] = start[1]
+            indent_chances[start[1]] = True
+        elif token_type in STRING_STARTS or token_type == tokenize.COMMENT:
+            indent_chances[start[1]] = str # Implicit string concatenation
+        elif not row and not depth and text in ("assert", "raise", "with"):
+            indent_chances[end[1] + 1] = True
+        elif not indent_chances and not row and not depth and text == 'if':
+            indent_chances[end[1] + 1] = True
+        elif text == ':' and physical[end[1]:].isspace():
+            open_rows[depth].append(row)
+
+        # Bracket depth
+        if token_type == tokenize.OP:
+            if text in '([{':
+                depth += 1
+                indent.append(0)
+                hangs.append(None)
+                if len(open_rows) == depth:
+                    open_rows.append([])
+                open_rows[depth].append(row)
+                parens[row] += 1
+            elif text in ')]}' and depth > 0:
+                prev_indent = indent.pop() or last_indent[1]
+                hangs.pop()
+                for d in range(depth):
+                    if indent[d] > prev_indent:
+                        indent[d] = 0
+                for ind in list(indent_chances):
+                    if ind >= prev_indent:
+                        del indent_chances[ind]
+                del open_rows[depth + 1:]
+                depth -= 1
+                if depth:
+                    indent_chances[indent[depth]] = True
+                for idx in range(row, -1, -1):
+                    if parens[idx]:
+                        parens[idx] -= 1
+                        break
+            if start[1] not in indent_chances:
+                indent_chances[start[1]] = text # Allow lining up tokens
+
+        last_token_multiline = (start[0] != end[0])
+        if last_token_multiline:
+            rel_indent[end[0] - first_row] = rel_indent[row]
+
+    if indent_next and expand_indent(physical) == indent_level + INDENT_SIZE:
+        yield 'E129' if visual_indent else 'E125'
+
+def whitespace_before_parameters(line):
+    """E211: whitespace before a call or subscript bracket."""
+    tokens = line.tokens
+    prev_type, prev_text, __, prev_end, __ = tokens[0]
+    for index in range(1, len(tokens)):
+        token_type, text, start, end, __ = tokens[index]
+        if (token_type == tokenize.OP and
+                text in '([' and
+                start != prev_end and
+                (prev_type == tokenize.NAME or prev_text in '}])') and
+                (index < 2 or tokens[index - 2][1] != 'class') and
+                not keyword.iskeyword(prev_text) and
+                (prev_text == 'type' or not keyword.issoftkeyword(prev_text))):
+            yield 'E211'
+        prev_type = token_type
+        prev_text = text
+        prev_end = end
+
+def whitespace_around_operator(line):
+    """E221-E224: spacing around operators."""
+    for match in OPERATOR_RE.finditer(line.text):
+        before, after = match.groups()
+        if '\t' in before:
+            yield 'E223'
+        elif len(before) > 1:
+            yield 'E221'
+        if '\t' in after:
+            yield 'E224'
+        elif len(after) > 1:
+            yield 'E222'
+
+def missing_whitespace(line):
+    """E225-E228 and E231: missing whitespace around operators and after punctuation."""
+    need_space = False
+    prev_type = tokenize.OP
+    prev_text = prev_end = None
+    operator_types = (tokenize.OP, tokenize.NAME)
+    brace_stack = []
+    for token_type, text, start, end, physical in line.tokens:
+        if token_type == tokenize.OP and text in ('[', '(', '{'):
+            brace_stack.append(text)
+        elif token_type == FSTRING_START:
+            brace_stack.append('f')
+        elif token_type == TSTRING_START:
+            brace_stack.append('t')
+        elif token_type == tokenize.NAME and text == 'lambda':
+            brace_stack.append('l')
+        elif brace_stack:
+            if token_type == tokenize.OP and text in (']', ')', '}'):
+                brace_stack.pop()
+            elif token_type == FSTRING_END or token_type == TSTRING_END:
+                brace_stack.pop()
+            elif brace_stack[-1] == 'l' and token_type == tokenize.OP and text == ':':
+                brace_stack.pop()
+
+        if token_type in SKIP_COMMENTS:
+            continue
+
+        if token_type == tokenize.OP and text in (',', ';', ':'):
+            next_char = physical[end[1]:end[1] + 1]
+            if next_char not in WHITESPACE and next_char not in '\r\n':
+                if text == ':' and brace_stack[-1:] == ['[']:
+                    pass # Slice
+                elif text == ':' and brace_stack[-2:] in (['f', '{'], ['t', '{']):
+                    pass # f-string format specifier
+                elif text == ',' and next_char in ')]':
+                    pass # Tuple
+                else:
+                    yield 'E231'
+
+        if need_space:
+            if start != prev_end:
+                # Found a (probably) needed space
+                if need_space is not True and not need_space[1]:
+                    yield 'E225'
+                need_space = False
+            elif prev_text == '/' and text in (',', ')', ':') or prev_text == ')' and text == ':':
+                pass # Positional-only parameter marker
+            else:
+                if need_space is True or need_space[1]:
+                    yield 'E225' # A needed trailing space was not found
+                elif prev_text != '**':
+                    if prev_text == '%':
+                        yield 'E228'
+                    elif prev_text not in ARITHMETIC_OP:
+                        yield 'E227'
+                    else:
+                        yield 'E226'
+                need_space = False
+        elif token_type in operator_types and prev_end is not None:
+            if text == '=' and (brace_stack[-1:] in (['l'], ['(']) or brace_stack[-2:] in (['f', '{'], ['t', '{'])):
+                pass # Keyword arguments, lambda defaults and f-string '=' specifiers
+            elif text in WS_NEEDED_OPERATORS:
+                need_space = True
+            elif text in UNARY_OPERATORS:
+                # Binary use only: -x, foo(*args) and foo(**kwargs) are fine
+                if prev_type == tokenize.OP and prev_text in '}])' or (
+                        prev_type != tokenize.OP and
+                        prev_text not in KEYWORDS and
+                        not keyword.issoftkeyword(prev_text)):
+                    need_space = None
+            elif text in WS_OPTIONAL_OPERATORS:
+                need_space = None
+
+            if need_space is None:
+                # Surrounding space is optional, but trailing space must match opening space
+                need_space = (prev_end, start != prev_end)
+            elif need_space and start == prev_end:
+                yield 'E225' # A needed opening space was not found
+                need_space = False
+        prev_type = token_type
+        prev_text = text
+        prev_end = end
+
+def whitespace_around_named_parameter_equals(line):
+    """E251/E252: spacing around keyword and default '='."""
+    paren_stack = []
+    no_space = False
+    require_space = False
+    prev_end = None
+    annotated_func_arg = False
+    in_def = bool(STARTSWITH_DEF_RE.match(line.text))
+    in_generic = bool(STARTSWITH_GENERIC_RE.match(line.text))
+
+    for token_type, text, start, end, physical in line.tokens:
+        if token_type == tokenize.NL:
+            continue
+        if no_space:
+            no_space = False
+            if start != prev_end:
+                yield 'E251'
+        if require_space:
+            require_space = False
+            if start == prev_end:
+                yield 'E252'
+        if token_type == tokenize.OP:
+            if text in '([':
+                paren_stack.append(text)
+            elif text in ')]' and paren_stack:
+                paren_stack.pop()
+            elif text == ':' and in_def and paren_stack == ['(']:
+                annotated_func_arg = True
+            elif len(paren_stack) == 1 and text == ',':
+                annotated_func_arg = False
+            elif paren_stack and text == '=':
+                if (in_generic and paren_stack == ['[']) or (annotated_func_arg and paren_stack == ['(']):
+                    require_space = True
+                    if start == prev_end:
+                        yield 'E252'
+                else:
+                    no_space = True
+                    if start != prev_end:
+                        yield 'E251'
+            if not paren_stack:
+                annotated_func_arg = False
+        prev_end = end
+
+def whitespace_before_comment(line):
+    """E261-E266: inline and block comment formatting."""
+    prev_end = (0, 0)
+    for token_type, text, start, end, physical in line.tokens:
+        if token_type == tokenize.COMMENT:
+            inline_comment = physical[:start[1]].strip()
+            if inline_comment:
+                if prev_end[0] == start[0] and start[1] < prev_end[1] + 2:
+                    yield 'E261'
+            symbol, sp, comment = text.partition(' ')
+            bad_prefix = symbol not in '#:' and (symbol.lstrip('#')[:1] or '#')
+            if inline_comment:
+                if bad_prefix or comment[:1] in WHITESPACE:
+                    yield 'E262'
+            elif bad_prefix and (bad_prefix != '!' or start[0] > 1):
+                if bad_prefix != '#':
+                    yield 'E265'
+                elif comment:
+                    yield 'E266'
+        elif token_type != tokenize.NL:
+            prev_end = end
+
+def explicit_line_join(line):
+    """E502: backslash continuation inside brackets."""
+    prev_start = prev_end = parens = 0
+    comment = False
+    backslash = None
+    for token_type, text, start, end, physical in line.tokens:
+        if token_type == tokenize.COMMENT:
+            comment = True
+        if start[0] != prev_start and parens and backslash and not comment:
+            yield 'E502'
+        if start[0] != prev_start:
+            comment = False
+        if end[0] != prev_end:
+            backslash = physical.rstrip('\r\n').endswith('\\')
+            prev_start = prev_end = end[0]
+        else:
+            prev_start = start[0]
+        if token_type == tokenize.OP:
+            if text in '([{':
+                parens += 1
+            elif text in ')]}':
+                parens -= 1
+
+def invalid_escape_sequence(line):
+    """W605: invalid escape sequences in non-raw strings."""
+    if line.noqa:
+        return
+    prefixes = []
+    for token_type, text, start, end, physical in line.tokens:
+        if token_type in STRING_STARTS:
+            prefixes.append(text[:text.index(text[-1])].lower()) # String modifiers (e.g. u or r)
+        if token_type in STRING_MIDDLES and 'r' not in prefixes[-1]:
+            pos = text.find('\\')
+            while pos >= 0:
+                pos += 1
+                if text[pos] not in VALID_ESCAPES:
+                    yield 'W605'
+                pos = text.find('\\', pos + 1)
+        if token_type in STRING_ENDS:
+            prefixes.pop()
+
+LOGICAL_CHECKS = [
+    blank_lines,
+    extraneous_whitespace,
+    whitespace_around_keywords,
+    missing_whitespace_after_keyword,
+    indentation,
+    continued_indentation,
+    whitespace_before_parameters,
+    whitespace_around_operator,
+    missing_whitespace,
+    whitespace_around_named_parameter_equals,
+    whitespace_before_comment,
+    explicit_line_join,
+    invalid_escape_sequence,
+]
+
+
+# --- Engine ---
+
+# Checker state carried from one part of a file into the next (see
+# count_unit_violations): (indent_char, previous_logical,
+# previous_unindented_logical_line, previous_indent_level, blank_lines,
+# blank_before, last physical line). This is the state at the start of a file.
+INITIAL_STATE = (None, '', '', 0, 0, 0, '')
+
+
+class StyleChecker:
+    """
+    Counts PEP 8 violations from an existing token stream.
+
+    This follows pycodestyle's Checker (logical line assembly, blank line
+    tracking, physical line checks at end-of-line tokens) but reuses the
+    tokens the caller already has instead of tokenizing again, and calls
+    only the checks in CATEGORIES directly.
+
+    Given the state another checker ended in, it checks a file's later lines
+    as if it had checked the earlier ones too. A checkpoint, if given, is
+    called every CHECKPOINT_INTERVAL tokens and may raise to stop the check
+    (e.g. when a time budget runs out).
+    """
+
+    def __init__(self, tokens, lines, state=INITIAL_STATE, checkpoint=None):
+        self.lines = lines
+        self.total_lines = len(lines)
+        self.counts = Counter()
+        self.state = state
+        self.checkpoint = checkpoint
+        if tokens or not lines:
+            self.tokens = [token for token in tokens if token.type != tokenize.ENCODING]
+            self._lines_tokenized = self.total_lines
+        else:
+            self.tokens = self._tokens_until_error()
+
+    def _tokens_until_error(self):
+        """
+        Tokenizes the lines, keeping the tokens produced before a tokenization
+        error, which are what pycodestyle checks when the code does not tokenize.
+        """
+        lines = list(self.lines)
+        if not lines[-1].endswith('\n'):
+            lines[-1] += '\n' # As pycodestyle reads the snippet
+        self._lines_tokenized = 0
+
+        def readline():
+            if self._lines_tokenized == len(lines):
+                return ''
+            self._lines_tokenized += 1
+            return lines[self._lines_tokenized - 1]
+
+        tokens = []
+        try:
+            for token in tokenize.generate_tokens(readline):
+                tokens.append(token)
+                if self.checkpoint is not None and not len(tokens) % CHECKPOINT_INTERVAL:
+                    self.checkpoint()
+        except (SyntaxError, tokenize.TokenError):
+            pass
+        return tokens
+
+    def _report(self, code):
+        if is_reported(code):
+            self.counts[code] += 1
+
+    def _check_physical(self, physical, line_number, multiline=False, noqa=False):
+        for code in check_physical_line(physical, line_number, self.indent_char, multiline, noqa):
+            self._report(code)
+            if code == 'E101':
+                self.indent_char = physical[0]
+
+    def _read_indent_char(self, line_number):
+        # pycodestyle takes the indent character from the first line its tokenizer reads
+        # that starts with whitespace; the tokenizer has read up to the current token
+        while self._lines_read < min(line_number, self.total_lines):
+            first = self.lines[self._lines_read][:1]
+            self._lines_read += 1
+            if first in WHITESPACE:
+                self.indent_char = first
+                return
+
+    def _maybe_check_physical(self, token):
+        """Runs the physical checks when token ends one or more physical lines."""
+        token_type = token.type
+        if self.indent_char is None:
+            self._read_indent_char(token.end[0])
+        if token_type == FSTRING_START:
+            self._fstring_start = token.start[0]
+        elif token_type == TSTRING_START:
+            self._tstring_start = token.start[0]
+        elif token_type in NEWLINE or (token.line.endswith('\\\n') and token.line[token.end[1]:].lstrip() == '\\\n'):
+            # The NEWLINE added for a missing final newline carries no line
+            physical = token.line or self.lines[token.start[0] - 1]
+            self._check_physical(physical, token.start[0], noqa=bool(NOQA_RE.search(token.line)))
+        elif token_type == tokenize.STRING and '\n' in token.string or token_type in (FSTRING_END, TSTRING_END):
+            # Every line of a multiline string but the last, which is checked as a normal line
+            if NOQA_RE.search(token.line):
+                return
+            if token_type == FSTRING_END:
+                start = self._fstring_start
+            elif token_type == TSTRING_END:
+                start = self._tstring_start
+            else:
+                start = token.start[0]
+            for line_number in range(start, token.end[0]):
+                self._check_physical(self.lines[line_number - 1] + '\n', line_number, multiline=True)
+
+    def _build_logical_line(self, logical_tokens):
+        text_parts = []
+        comments = []
+        prev_row = prev_col = None
+        started = False
+        for token_type, text, start, end, physical in logical_tokens:
+            if token_type in SKIP_TOKENS:
+                continue
+            started = True
+            if token_type == tokenize.COMMENT:
+                comments.append(text)
+                continue
+            if token_type == tokenize.STRING:
+                text = mute_string(text)
+            elif token_type == FSTRING_MIDDLE or token_type == TSTRING_MIDDLE:
+                # These tokens hold unescaped braces; re-escape them
+                brace_count = text.count('{') + text.count('}')
+                text = 'x' * (len(text) + brace_count)
+                end = (end[0], end[1] + brace_count)
+            if prev_row:
+                start_row, start_col = start
+                if prev_row != start_row:
+                    prev_text = self.lines[prev_row - 1][prev_col - 1]
+                    if prev_text == ',' or (prev_text not in '{[(' and text not in '}])'):
+                        text = ' ' + text
+                elif prev_col != start_col:
+                    text = physical[prev_col:start_col] + text
+            text_parts.append(text)
+            prev_row, prev_col = end
+        if not started:
+            return None, False
+        return ''.join(text_parts), bool(comments and NOQA_RE.search(''.join(comments)))
+
+    def _check_logical(self, logical_tokens, line_number):
+        """
+        Runs the logical checks on a complete logical line.
+
+        Returns:
+            bool: False if the tokens hold no content yet (indents, dedents and
+                  newlines only); like pycodestyle, they then carry over to the next line.
+        """
+        text, noqa = self._build_logical_line(logical_tokens)
+        if text is None:
+            return False
+
+        first = next(token for token in logical_tokens if token.type not in SKIP_TOKENS)
+        start_row, start_col = first.start
+        line = LogicalLine()
+        line.text = text
+        line.tokens = logical_tokens
+        line.noqa = noqa
+        line.line_number = line_number
+        line.indent_level = expand_indent(self.lines[start_row - 1][:start_col])
+        line.indent_char = self.indent_char
+        line.previous_logical = self.previous_logical
+        line.previous_indent_level = self.previous_indent_level
+        line.previous_unindented_logical_line = self.previous_unindented_logical_line
+        if self.blank_before < self.blank_lines:
+            self.blank_before = self.blank_lines
+        line.blank_lines = self.blank_lines
+        line.blank_before = self.blank_before
+        line.lines = self.lines
+        line.line_before = self.line_before
+
+        for check in LOGICAL_CHECKS:
+            for code in check(line):
+                self._report(code)
+
+        if text:
+            self.previous_indent_level = line.indent_level
+            self.previous_logical = text
+            if not line.indent_level:
+                self.previous_unindented_logical_line = text
+        self.blank_lines = 0
+        return True
+
+    def check_all(self):
+        """
+        Returns:
+            Counter: Number of violations per pycodestyle code.
+        """
+        (self.indent_char, self.previous_logical, self.previous_unindented_logical_line,
+         self.previous_indent_level, self.blank_lines, self.blank_before, self.line_before) = self.state
+        self._lines_read = 0
+        self._fstring_start = self._tstring_start = 0
+
+        logical_tokens = []
+        parens = 0
+        for index, token in enumerate(self.tokens):
+            if token.start[0] > self.total_lines:
+                break
+            if self.checkpoint is not None and not index % CHECKPOINT_INTERVAL:
+                self.checkpoint()
+            self._maybe_check_physical(token)
+            logical_tokens.append(token)
+            token_type, text = token.type, token.string
+            if token_type == tokenize.OP:
+                if text in '([{':
+                    parens += 1
+                elif text in '}])':
+                    parens -= 1
+            elif not parens and token_type in NEWLINE:
+                if token_type == tokenize.NEWLINE:
+                    if self._check_logical(logical_tokens, token.start[0]):
+                        logical_tokens = []
+                    self.blank_before = 0
+                elif len(logical_tokens) == 1:
+                    # The physical line holds only this token
+                    self.blank_lines += 1
+                    logical_tokens = []
+                elif self._check_logical(logical_tokens, token.start[0]):
+                    logical_tokens = []
+        if logical_tokens:
+            if self.indent_char is None:
+                self._read_indent_char(self._lines_tokenized)
+            self._check_physical(self.lines[-1], self.total_lines)
+            self._check_logical(logical_tokens, self.total_lines)
+        self.state = (self.indent_char, self.previous_logical, self.previous_unindented_logical_line,
+                      self.previous_indent_level, self.blank_lines, self.blank_before,
+                      self.lines[-1] if self.lines else self.line_before)
+        return self.counts
+
+
+def count_violations(tokens, lines, checkpoint=None):
+    """
+    Counts PEP 8 violations in CATEGORIES using the built-in engine.
+
+    Args:
+        tokens (list): tokenize.TokenInfo for the code (an ENCODING token is ignored).
+            If empty, e.g. because the code does not tokenize, the code is tokenized
+            up to the error.
+        lines (list): The code's physical lines, as returned by physical_lines.
+        checkpoint (callable): Called every CHECKPOINT_INTERVAL tokens; may raise to stop.
+
+    Returns:
+        Counter: Number of violations per pycodestyle code.
+    """
+    return StyleChecker(tokens, lines, checkpoint=checkpoint).check_all()
+
+def count_unit_violations(tokens, lines, state=INITIAL_STATE, checkpoint=None):
+    """
+    Counts PEP 8 violations in one part of a file: whole lines that start a
+    top-level statement and end one (the last part may end the file), so that
+    the counts of all parts, each checked from the state the previous one
+    ended in, add up to the counts for the whole file.
+
+    Args:
+        tokens (list): tokenize.TokenInfo for the part's lines alone.
+        lines (list): The part's physical lines, each but the file's last ending in a newline.
+        state (tuple): The state the previous part ended in, or INITIAL_STATE for the first.
+        checkpoint (callable): Called every CHECKPOINT_INTERVAL tokens; may raise to stop.
+
+    Returns:
+        tuple: (Counter of violations per pycodestyle code, state at the end of the part)
+    """
+    checker = StyleChecker(tokens, lines, state, checkpoint)
+    return checker.check_all(), checker.state
+
+def reference_violations(lines):
+    """
+    Counts the same violations with pycodestyle itself, for the reference mode
+    and parity checks. Requires PYCODESTYLE_AVAILABLE.
+
+    Args:
+        lines (list): The code's physical lines, as returned by physical_lines.
+
+    Returns:
+        Counter: Number of violations per pycodestyle code.
+    """
+    import pycodestyle
+    lines = list(lines)
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    checker = pycodestyle.Checker(filename='snippet.py', lines=lines, quiet=True)
+    checker.check_all()
+    return Counter({
+        code: count for code, count in checker.report.counters.items()
+        if code.startswith(CATEGORIES) and code not in EXCLUDED_CODES
+    })
@@ -0,0 +1,331 @@
+import argparse
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+from functools import lru_cache
+
+# Get logger from main application or create a new one if imported directly
+logger = logging.getLogger("py-api.words")
+
+# --- Configuration ---
+# Word list built by `python words.py` (see build_word_list). The built list is
+# committed, so it is installed with the code; rebuild it after changing its sources.
+WORD_LIST_PATH = os.environ.get(
+    "PY_WORD_LIST", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "words.bin"))
+# Lists of the english-words package (pip install english-words==2.0.2) the
+# word list is built from by default: web2, Webster's Second International,
+# which is in the public domain
+PACKAGE_WORD_LISTS = ('web2',)
+# Fewest words an installed list should have; with fewer, ordinary English
+# names stop segmenting and analyze_naming scores them as unusual
+MIN_WORD_COUNT = 100000
+# Identifiers whose segmentation is remembered per process
+SEGMENT_CACHE_SIZE = int(os.environ.get("PY_SEGMENT_CACHE_SIZE", "65536"))
+# Shortest word a piece of an identifier may be or be split into. Every letter
+# is in the list, so without it `i`, `x` or the `n` of `n_items` would count as words
+MIN_WORD_LENGTH = 2
+
+# --- File Format ---
+# HEADER (magic, word count, digest of the rest of the file), the INDEX, then
+# the word data: the lowercase ASCII words, sorted, each preceded by a newline,
+# plus a final newline. The INDEX has a slot for every string of up to
+# INDEX_DEPTH letters (see index_slots) holding the offset into the data of the
+# newline before the first word sorting at or after it, so the words starting
+# with a fragment lie between the offsets of its first and end slots.
+MAGIC = b"PYWORDS2"
+HEADER = struct.Struct("<8sI16s")
+INDEX_DEPTH = 3
+INDEX = struct.Struct(f"<{27 ** INDEX_DEPTH + 1}I")
+WORD_RE = re.compile(r'[a-z]+')
+
+# camelCase, PascalCase, ACRONYM and digit runs inside an underscore-separated part
+PIECE_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+
+
+# --- Vocabularies ---
+
+class WordList:
+    """
+    A sorted word list in the format above. The file is memory-mapped
+    read-only, so loading it costs no parsing and every worker process shares
+    the same pages of the page cache. A lookup is one mmap.find over the words
+    sharing the fragment's first three letters (a few KiB), so it runs in C.
+    An in-memory set of the same words segments about three times faster
+    uncached, but takes a second and some 50 MB per worker to load; names
+    repeated across submissions are answered from the Segmenter's cache either way.
+
+    extra_words are looked up alongside the file, for the handful of words a
+    dictionary lacks but code is full of (url, api, tmp, config...).
+    """
+
+    def __init__(self, path, extra_words=()):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, digest = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a word list (bad magic {magic!r})")
+        data_start = HEADER.size + INDEX.size
+        self._index = [data_start + offset for offset in INDEX.unpack_from(self._map, HEADER.size)]
+        if self._index[-1] >= len(self._map):
+            raise ValueError(f"{path} is truncated")
+        self._bounds = {} # First INDEX_DEPTH letters of a fragment -> where the words starting with them lie
+        self._extra = WordSet(extra_words) if extra_words else None
+        self.id = digest.hex()[:12] # Identifies the list in cache keys
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, word):
+        return self.match(word)[0]
+
+    def match(self, fragment, low=0):
+        """
+        Args:
+            fragment (str): Lowercase text to look up.
+            low (int): Position no greater than fragment's, e.g. the one
+                returned for a prefix of it.
+
+        Returns:
+            tuple: (is_word, can_extend, position) - whether fragment is in the
+                   list, whether a longer word in the list starts with it, and
+                   where the first word starting with it is in the file.
+        """
+        is_word = can_extend = False
+        prefix = fragment[:INDEX_DEPTH]
+        bounds = self._bounds.get(prefix)
+        if bounds is None:
+            slots = index_slots(prefix)
+            bounds = (self._index[slots[0]], self._index[slots[1]]) if slots is not None else (0, 0)
+            if slots is not None:
+                self._bounds[prefix] = bounds
+        key = b"\n" + fragment.encode('ascii', 'replace') # '?' is in no word
+        position = self._map.find(key, max(low, bounds[0]), bounds[1])
+        if position >= 0:
+            low = position
+            after = position + len(key)
+            is_word = self._map[after] == 10 # b"\n"
+            # The first word starting with fragment is longer, or is fragment and the next one starts with it too
+            can_extend = not is_word or self._map[after:after + len(key)] == key
+        if self._extra is not None:
+            extra_is_word, extra_can_extend, _ = self._extra.match(fragment)
+            is_word, can_extend = is_word or extra_is_word, can_extend or extra_can_extend
+        return is_word, can_extend, low
+
+
+def index_slots(word):
+    """
+    Returns:
+        tuple: The INDEX slots (first, end) bounding the words that start with
+               word, or None if word is empty or its first INDEX_DEPTH
+               characters are not all a-z.
+    """
+    slot = 0
+    for char in word[:INDEX_DEPTH]:
+        digit = ord(char) - 96 # a is 1; 0 stands for the end of a shorter word
+        if not 0 < digit < 27:
+            return None
+        slot = slot * 27 + digit
+    if not slot:
+        return None
+    span = 27 ** (INDEX_DEPTH - len(word)) if len(word) < INDEX_DEPTH else 1
+    return slot * span, (slot + 1) * span
+
+
+class WordSet:
+    """An in-memory vocabulary with the WordList interface, used when no word list is installed."""
+
+    id = "builtin"
+
+    def __init__(self, words):
+        self._words = frozenset(word.lower() for word in words)
+        self._prefixes = frozenset(word[:end] for word in self._words for end in range(1, len(word)))
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, word):
+        return word in self._words
+
+    def match(self, fragment, low=0):
+        return fragment in self._words, fragment in self._prefixes, low
+
+
+def load_vocabulary(fallback_words, path=WORD_LIST_PATH):
+    """
+    Opens the installed word list, or falls back to an in-memory set.
+
+    A missing or unreadable list is logged as an error, and one smaller than
+    MIN_WORD_COUNT as a warning: either way most names stop segmenting.
+
+    Args:
+        fallback_words (iterable): Words looked up alongside the list, and the
+            whole vocabulary if path is missing or unreadable.
+        path (str): The word list built by build_word_list.
+
+    Returns:
+        WordList or WordSet
+    """
+    if not os.path.exists(path):
+        logger.error(f"No word list at {path}; segmenting identifiers with {len(fallback_words)} built-in words only. "
+                     f"Build it with `python words.py` or point PY_WORD_LIST at one")
+        return WordSet(fallback_words)
+    try:
+        vocabulary = WordList(path, fallback_words)
+    except (OSError, ValueError, struct.error) as e:
+        logger.error(f"Could not load word list {path}: {e}; segmenting identifiers with "
+                     f"{len(fallback_words)} built-in words only")
+        return WordSet(fallback_words)
+    if len(vocabulary) < MIN_WORD_COUNT:
+        logger.warning(f"Word list {path} has only {len(vocabulary)} words (expected at least {MIN_WORD_COUNT})")
+    else:
+        logger.info(f"Loaded {len(vocabulary)} words from {path}")
+    return vocabulary
+
+
+# --- Segmentation ---
+
+class Segmenter:
+    """Splits identifiers into dictionary words, remembering the result per identifier."""
+
+    def __init__(self, vocabulary, cache_size=SEGMENT_CACHE_SIZE):
+        self.vocabulary = vocabulary
+        self.segment = lru_cache(maxsize=cache_size)(self._segment)
+
+    def _segment(self, name):
+        """
+        Splits name on underscores, case changes and digit runs, then splits
+        each lowercased piece into the fewest dictionary words.
+
+        Returns:
+            tuple: The words (digit runs are kept as they are), or None if some
+                   piece is not made of dictionary words.
+        """
+        words = []
+        for part in name.split('_'):
+            if not part:
+                continue
+            if not (part.isascii() and part.isalnum()):
+                return None
+            for piece in PIECE_RE.findall(part):
+                if piece.isdigit():
+                    words.append(piece)
+                    continue
+                split = self._split_piece(piece.lower())
+                if split is None:
+                    return None
+                words.extend(split)
+        return tuple(words)
+
+    def _split_piece(self, piece):
+        """Fewest words piece splits into (first such split), or None; one dynamic-programming pass."""
+        if len(piece) >= MIN_WORD_LENGTH and piece in self.vocabulary:
+            return (piece,)
+        length = len(piece)
+        best = [None] * (length + 1) # best[i]: fewest words covering piece[:i], as (count, start of last word)
+        best[0] = (0, 0)
+        for start in range(length):
+            if best[start] is None:
+                continue
+            count = best[start][0] + 1
+            low = 0 # Each longer fragment sorts after the one before it
+            for end in range(start + 1, length + 1):
+                is_word, can_extend, low = self.vocabulary.match(piece[start:end], low)
+                if is_word and end - start >= MIN_WORD_LENGTH and (best[end] is None or count < best[end][0]):
+                    best[end] = (count, start)
+                if not can_extend:
+                    break
+        if best[length] is None:
+            return None
+        split = []
+        end = length
+        while end:
+            start = best[end][1]
+            split.append(piece[start:end])
+            end = start
+        return tuple(reversed(split))
+
+
+# --- Building ---
+
+def read_words(paths):
+    """
+    Reads words from text files with one word per line; anything after the
+    first whitespace (e.g. a frequency count) is ignored.
+    """
+    words = set()
+    for path in paths:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                fields = line.split(maxsplit=1)
+                if fields and WORD_RE.fullmatch(fields[0].lower()):
+                    words.add(fields[0].lower())
+    return words
+
+def read_package_words(lists=PACKAGE_WORD_LISTS):
+    """
+    Reads words from word lists of the english-words package.
+
+    Raises:
+        ImportError: If english-words is not installed.
+    """
+    try:
+        from english_words import get_english_words_set
+    except ImportError:
+        raise ImportError("english-words is not installed (pip install english-words==2.0.2)") from None
+    return {word for word in get_english_words_set(lists, alpha=True, lower=True) if WORD_RE.fullmatch(word)}
+
+def build_word_list(words, path):
+    """
+    Writes words in the word list format.
+
+    Returns:
+        int: Number of words written.
+    """
+    words = sorted(set(words))
+    data = bytearray()
+    index = [None] * (27 ** INDEX_DEPTH + 1)
+    for word in words:
+        slots = index_slots(word)
+        if slots is not None and index[slots[0]] is None:
+            index[slots[0]] = len(data)
+        data += b"\n" + word.encode('ascii')
+    index[-1] = len(data)
+    data += b"\n"
+    for slot in range(len(index) - 2, -1, -1): # Slots no word starts at get the next one's offset
+        if index[slot] is None:
+            index[slot] = index[slot + 1]
+    body = INDEX.pack(*index) + data
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(words), digest))
+        f.write(body)
+    os.replace(temporary, path) # Workers that already mapped the old file keep reading it
+    return len(words)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Builds the word list used to segment identifiers.")
+    parser.add_argument('sources', nargs='*', help="Text files with one word per line (e.g. /usr/share/dict/words)")
+    parser.add_argument('--package', nargs='+', default=None,
+                        help=f"english-words lists to add (default, without sources: {' '.join(PACKAGE_WORD_LISTS)})")
+    parser.add_argument('--min-words', type=int, default=MIN_WORD_COUNT,
+                        help=f"Refuse to write a list with fewer words (default: {MIN_WORD_COUNT})")
+    parser.add_argument('-o', '--output', default=WORD_LIST_PATH, help=f"Output file (default: {WORD_LIST_PATH})")
+    args = parser.parse_args()
+    word_set = read_words(args.sources)
+    package_lists = args.package if args.package is not None else () if args.sources else PACKAGE_WORD_LISTS
+    if package_lists:
+        try:
+            word_set |= read_package_words(package_lists)
+        except (ImportError, ValueError) as e:
+            sys.exit(f"Could not read english-words lists {', '.join(package_lists)}: {e}")
+    if len(word_set) < args.min_words:
+        sys.exit(f"Only {len(word_set)} words found, fewer than --min-words {args.min_words}; not writing {args.output}")
+    count = build_word_list(word_set, args.output)
+    print(f"Wrote {count} words to {args.output}")
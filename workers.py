@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+
+from dispatch import AnalysisError, run_analyzer
+
+# Get logger from main application or create a new one if imported directly
+logger = logging.getLogger("py-api.workers")
+
+# Same deadline the API always gave a script subprocess
+DEFAULT_TIMEOUT = 10
+
+
+def _worker_main(conn):
+    """Worker process loop: import every analyzer once, then serve jobs until told to stop."""
+    import dispatch # Warm-up: pulls in all analyzer modules before the first job arrives
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        function, args = job
+        try:
+            conn.send(("ok", function(*args)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+
+class AnalyzerPool:
+    """
+    A fixed-size pool of pre-warmed analyzer processes.
+
+    Each job is sent to an idle worker over a pipe and must answer within
+    `timeout` seconds. A worker that misses the deadline or dies is killed and
+    replaced, so one bad document cannot take the pool down.
+    """
+
+    def __init__(self, size=None, timeout=DEFAULT_TIMEOUT):
+        self.size = size or os.cpu_count() or 1
+        self.timeout = timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = None
+
+    def start(self):
+        logger.info(f"Starting analyzer pool with {self.size} workers")
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(self._spawn())
+
+    def _spawn(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    async def _replace(self, worker):
+        worker.process.kill()
+        # Reaping the killed process can block for up to a second; not on the event loop
+        await asyncio.get_running_loop().run_in_executor(None, worker.process.join, 1)
+        worker.conn.close()
+        return self._spawn()
+
+    async def run(self, script_name, document):
+        """
+        Runs a registered analyzer on a pooled worker.
+
+        The document is pickled across the pipe, so workers never talk to
+        MongoDB themselves.
+
+        Returns:
+            dict: The analyzer result.
+
+        Raises:
+            AnalysisError: If the analyzer failed, timed out or crashed its worker.
+            RuntimeError: If the pool has not been started.
+        """
+        return await self._call(script_name, run_analyzer, (script_name, document), f" for document: {document.get('_id')}")
+
+    async def call(self, function, *args):
+        """
+        Calls a module-level function (e.g. checkcodetype.detect_language) on
+        a pooled worker, under the same timeout as an analyzer. The function
+        and its arguments are pickled across the pipe.
+
+        Returns:
+            The function's return value.
+
+        Raises:
+            AnalysisError: If the function raised, timed out or crashed its worker.
+            RuntimeError: If the pool has not been started.
+        """
+        return await self._call(function.__name__, function, args)
+
+    async def _call(self, name, function, args, context=""):
+        if self._idle is None:
+            raise RuntimeError("Analyzer pool is not started; call AnalyzerPool.start() (the API's lifespan does) before running jobs")
+        worker = await self._idle.get()
+        loop = asyncio.get_running_loop()
+        try:
+            if not worker.process.is_alive():
+                logger.warning("Found dead analyzer worker in the idle queue, replacing it")
+                worker = await self._replace(worker)
+            worker.conn.send((function, args))
+            ready = await loop.run_in_executor(None, worker.conn.poll, self.timeout)
+            if not ready:
+                logger.error(f"{name} timed out after {self.timeout} seconds{context}, replacing worker")
+                worker = await self._replace(worker)
+                raise AnalysisError(f"{name} timed out after {self.timeout} seconds")
+            status, payload = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            logger.error(f"Analyzer worker died while running {name}: {e}, replacing worker")
+            worker = await self._replace(worker)
+            raise AnalysisError(f"Analyzer worker exited unexpectedly while running {name}")
+        except asyncio.CancelledError:
+            # The job may still be running; don't hand its late answer to the next caller.
+            # _replace kills it before awaiting, so a second cancellation leaves a
+            # dead worker in the queue, which the next job replaces.
+            worker = await self._replace(worker)
+            raise
+        finally:
+            self._idle.put_nowait(worker)
+
+        if status == "error":
+            raise AnalysisError(payload)
+        return payload
+
+    def shutdown(self):
+        if self._idle is None:
+            return
+        logger.info("Shutting down analyzer pool")
+        workers = []
+        while not self._idle.empty():
+            workers.append(self._idle.get_nowait())
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.process.kill()
+            worker.conn.close()
+        self._idle = None
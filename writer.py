@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import os
+
+import db
+
+# Get logger from main application or create a new one if imported directly
+logger = logging.getLogger("py-api.writer")
+
+# --- Configuration ---
+BATCH_SIZE = int(os.environ.get("AIRESPONSE_BATCH_SIZE", "100"))
+FLUSH_INTERVAL = float(os.environ.get("AIRESPONSE_FLUSH_INTERVAL", "1.0"))
+MAX_PENDING = int(os.environ.get("AIRESPONSE_MAX_PENDING", "10000"))
+
+_STOP = object()
+
+
+class ResponseWriter:
+    """
+    Write-behind buffer for airesponse documents.
+
+    Requests hand their response document to `put` and move on; a background
+    task flushes the buffer with one `insert_many(ordered=False)` whenever
+    `batch_size` documents are waiting or the oldest has waited
+    `flush_interval` seconds. At most `max_pending` documents are buffered;
+    beyond that `put` waits for a flush, so a slow database pushes back on
+    the API instead of growing memory.
+
+    Documents carry a client-side `_id` (see main.build_ai_response), so they
+    can be logged and correlated before they reach the database.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, max_pending=MAX_PENDING):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        logger.info(f"Starting airesponse writer (batch size {self.batch_size}, flush interval {self.flush_interval}s)")
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, response_doc):
+        """Queues one document, waiting if the buffer is full. Writes directly if the writer is not running."""
+        if self._task is None or self._task.done():
+            await self._flush([response_doc])
+            return
+        await self._queue.put(response_doc)
+
+    async def stop(self):
+        """Flushes everything still buffered and stops the background task."""
+        if self._task is None:
+            return
+        logger.info("Stopping airesponse writer")
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    response_doc = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if response_doc is _STOP:
+                    stopping = True
+                    break
+                batch.append(response_doc)
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        try:
+            inserted_ids = await asyncio.to_thread(db.insert_ai_responses, batch)
+            logger.info(f"{len(inserted_ids)} AI responses stored successfully")
+        except Exception as e:
+            # ordered=False: everything but the failing documents was written
+            logger.error(f"Error storing {len(batch)} AI responses: {str(e)}")